@@ -0,0 +1,55 @@
+"""
+Atomic file replacement for the YAML remediation scripts.
+
+Output is written to a uniquely named temporary file in the target's
+directory and moved over the original with ``os.replace``, so an interrupted
+run leaves either the old or the new file, never a truncated one. Each
+writer gets its own temporary file, so processes writing the same target
+(for example the same parse-cache sidecar) cannot clobber each other's
+partial output; the last replace wins.
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# mkstemp creates files readable only by the owner; new files get the
+# permissions open() would have given them instead
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_open(path):
+    """Open a binary handle whose contents replace path on successful exit.
+
+    Args:
+        path: File to replace
+
+    Yields:
+        BinaryIO: Handle to the temporary file
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with open(fd, 'wb') as f:
+            yield f
+        try:
+            shutil.copymode(path, tmp)
+        except FileNotFoundError:
+            os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write(path, data: bytes) -> None:
+    """Replace the contents of path with data atomically."""
+    with atomic_open(path) as f:
+        f.write(data)
@@ -0,0 +1,24 @@
+"""
+YAML dumper shared by the remediation scripts.
+
+PyYAML's ``represent_dict`` copies every mapping into a list of items and,
+unless ``sort_keys=False``, sorts it. Framework files are written in the
+order their keys were loaded or inserted, and Python dicts preserve that
+order, so mappings are represented straight from ``dict.items()``.
+"""
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper
+
+
+class InsertionOrderDumper(SafeDumper):
+    """Safe dumper emitting mappings in insertion order, never sorted."""
+
+
+def _represent_dict(dumper, data):
+    return dumper.represent_mapping('tag:yaml.org,2002:map', data.items())
+
+
+InsertionOrderDumper.add_representer(dict, _represent_dict)
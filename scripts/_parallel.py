@@ -0,0 +1,54 @@
+"""
+Process-pool helpers shared by the YAML remediation scripts.
+
+Each script's per-file work is independent (read, transform, write), so the
+directory walk can be fanned out across worker processes. Worker functions
+must be module-level so they can be pickled.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def default_jobs() -> int:
+    """Return the default worker count (one per CPU)."""
+    return os.cpu_count() or 1
+
+
+def add_jobs_argument(parser) -> None:
+    """Add the standard ``--jobs`` option to an argparse parser."""
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=default_jobs(),
+        help='Number of worker processes (default: number of CPUs)'
+    )
+
+
+def map_files(func, paths, jobs=None, args=()):
+    """Apply func to every path, yielding ``(path, result)`` as each finishes.
+
+    Runs in-process when only one job is requested, avoiding pool start-up
+    cost for small trees. Exceptions raised by func propagate to the caller.
+
+    Args:
+        func: Module-level callable taking a path (plus args)
+        paths: Iterable of paths to process
+        jobs: Worker process count (defaults to the number of CPUs)
+        args: Extra positional arguments passed to func after the path
+
+    Yields:
+        tuple: (path, func(path, *args)) in completion order
+    """
+    paths = list(paths)
+    jobs = jobs or default_jobs()
+
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield path, func(path, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+        futures = {executor.submit(func, path, *args): path for path in paths}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -0,0 +1,126 @@
+"""
+Parsed-YAML sidecar cache for the remediation scripts.
+
+The scripts parse the same framework files one after another. The first
+parse of a file is saved as JSON under ``.cache/parsed/`` in the repository
+root, tagged with the file's mtime and size; later parses of the unchanged
+file load the JSON instead, which is several times faster than YAML even
+with libyaml. orjson is used when installed, the stdlib json module
+otherwise.
+
+Only files inside the repository are cached, and only documents made up of
+JSON-representable values (string keys; str, int, finite float, bool and
+None scalars), so a cached load returns exactly what the YAML parse would.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    from scripts._atomic import atomic_write
+except ImportError:  # executed directly rather than imported as scripts.*
+    from _atomic import atomic_write
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _sidecar_path(path):
+    """Return the sidecar for path, or None if path is outside the repository."""
+    root = os.path.abspath(os.getenv('SCRATCHPAD_DIR', Path(__file__).parent.parent))
+    try:
+        rel = os.path.relpath(os.path.abspath(path), root)
+    except ValueError:  # different drive on Windows
+        return None
+    if rel.startswith(os.pardir):
+        return None
+    return Path(root, '.cache', 'parsed', rel + '.json')
+
+
+def _is_json_safe(data) -> bool:
+    """Check that data survives a JSON round trip unchanged.
+
+    YAML aliases can make a container appear twice, or inside itself. JSON
+    would duplicate shared containers and cannot represent cycles, so any
+    container reached a second time makes the document unsafe; this also
+    keeps the walk linear on alias bombs.
+    """
+    seen = set()
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (dict, list)):
+            if id(node) in seen:
+                return False
+            seen.add(id(node))
+        if isinstance(node, dict):
+            if not all(isinstance(key, str) for key in node):
+                return False
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, float):
+            if not math.isfinite(node):
+                return False
+        elif node is not None and not isinstance(node, (str, int)):
+            return False
+    return True
+
+
+def load_yaml(path, content, loader, st):
+    """Parse content, the current contents of path, via the sidecar if fresh.
+
+    st must describe the file as it was when content was read: take it with
+    ``os.fstat`` on the open descriptor before reading. A stat taken after
+    the read could pair old content with a newer mtime and size, and the
+    stale parse would then be served until the file next changed.
+
+    Args:
+        path: File the content was read from
+        content: YAML text or bytes as read from path
+        loader: PyYAML loader class used on a cache miss
+        st: os.stat_result of path taken before content was read
+
+    Returns:
+        Any: The parsed document
+
+    Raises:
+        yaml.YAMLError: If YAML parsing fails
+    """
+    sidecar = _sidecar_path(path)
+    if sidecar is None:
+        return yaml.load(content, Loader=loader)
+
+    try:
+        cached = _loads(sidecar.read_bytes())
+        if cached['mtime'] == st.st_mtime_ns and cached['size'] == st.st_size:
+            return cached['data']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    data = yaml.load(content, Loader=loader)
+    if _is_json_safe(data):
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(sidecar, _dumps({'mtime': st.st_mtime_ns, 'size': st.st_size, 'data': data}))
+        except (OSError, TypeError, ValueError):
+            pass  # a missing sidecar only costs a re-parse next time
+    return data
@@ -0,0 +1,33 @@
+"""
+Directory walker shared by the YAML remediation scripts.
+
+Uses ``os.scandir`` directly instead of ``Path.glob('**/*.yml')``, which
+builds and stats a Path object per entry. The stat result comes from the
+directory entry, so callers get mtime/size for the compliance cache without
+a second ``stat()`` call.
+"""
+
+import os
+from pathlib import Path
+
+YAML_SUFFIXES = ('.yml', '.yaml')
+
+
+def iter_yaml(root, suffixes=YAML_SUFFIXES):
+    """Recursively yield YAML files below root.
+
+    Args:
+        root: Directory to walk
+        suffixes: File name suffixes to include
+
+    Yields:
+        tuple: (Path, os.stat_result) for each matching file
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffixes) and entry.is_file():
+                    yield Path(entry.path), entry.stat()
@@ -0,0 +1,80 @@
+"""
+Persistent compliance cache for the YAML remediation scripts.
+
+Records which files a script has already found to be compliant, keyed by
+path together with the file's mtime and size. On later runs a file whose
+stat signature is unchanged can be skipped without being opened or parsed.
+
+The cache lives in ``.cache/yaml_compliance.json`` under the repository root
+and is namespaced per script, since each script has its own notion of
+"nothing to do".
+"""
+
+import json
+import os
+from pathlib import Path
+
+try:
+    from scripts._atomic import atomic_write
+except ImportError:  # executed directly rather than imported as scripts.*
+    from _atomic import atomic_write
+
+CACHE_FILENAME = 'yaml_compliance.json'
+
+
+class ComplianceCache:
+    """mtime/size keyed record of files a script left untouched."""
+
+    def __init__(self, base_dir, namespace: str):
+        """Load the cache for one script.
+
+        Args:
+            base_dir: Repository root; the cache is stored in base_dir/.cache
+            namespace: Name of the script owning the entries
+        """
+        self.path = Path(base_dir) / '.cache' / CACHE_FILENAME
+        self.namespace = namespace
+        self._data = self._read()
+        self._entries = self._data.setdefault(namespace, {})
+        self._dirty = False
+
+    def _read(self) -> dict:
+        """Read the cache file, treating a missing or corrupt file as empty."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def is_compliant(self, filepath, st: os.stat_result) -> bool:
+        """Return True if filepath was compliant and is unchanged since."""
+        entry = self._entries.get(str(filepath))
+        return (
+            entry is not None
+            and entry.get('already_compliant', False)
+            and entry.get('mtime') == st.st_mtime_ns
+            and entry.get('size') == st.st_size
+        )
+
+    def mark_compliant(self, filepath, st: os.stat_result) -> None:
+        """Record that filepath needed no changes at the given stat."""
+        self._entries[str(filepath)] = {
+            'mtime': st.st_mtime_ns,
+            'size': st.st_size,
+            'already_compliant': True,
+        }
+        self._dirty = True
+
+    def invalidate(self, filepath) -> None:
+        """Forget filepath, e.g. after it has been rewritten."""
+        if self._entries.pop(str(filepath), None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache if any entry changed."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, json.dumps(self._data, indent=2, sort_keys=True).encode('utf-8'))
+        self._dirty = False
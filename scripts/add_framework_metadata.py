@@ -9,9 +9,31 @@ Author: Warp AI Agent
 Date: 2025-10-01
 """
 
+import os
+import re
 import yaml
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    from scripts._atomic import atomic_open, atomic_write
+    from scripts._dumper import InsertionOrderDumper
+    from scripts._parallel import add_jobs_argument, map_files
+    from scripts._parse_cache import load_yaml
+    from scripts._walk import iter_yaml
+    from scripts._yaml_cache import ComplianceCache
+except ImportError:  # executed directly rather than imported as scripts.*
+    from _atomic import atomic_open, atomic_write
+    from _dumper import InsertionOrderDumper
+    from _parallel import add_jobs_argument, map_files
+    from _parse_cache import load_yaml
+    from _walk import iter_yaml
+    from _yaml_cache import ComplianceCache
+
 # Metadata templates based on framework patterns
 METADATA_TEMPLATES = {
     # Core frameworks
@@ -129,46 +151,135 @@ METADATA_TEMPLATES = {
     },
 }
 
-def add_metadata_to_framework(yaml_path):
-    """Add metadata to a framework YAML file if missing.
+# Template keys, longest first, so the most specific substring match wins
+_TEMPLATE_KEYS = tuple(sorted(METADATA_TEMPLATES, key=len, reverse=True))
+
+# Cheap text probes used to avoid a full parse when metadata is wholly absent
+_METADATA_KEY_RE = re.compile(r'^(?:documentation|version)\s*:', re.MULTILINE)
+_BLOCK_KEY_RE = re.compile(r'[A-Za-z_][\w.-]*:(?:\s|$)')
+_DOC_BOUNDARY_RE = re.compile(r'^(?:---|\.\.\.)', re.MULTILINE)
+_VERSION_LINE_RE = re.compile(r'^version[ \t]*:(.*)$', re.MULTILINE)
+_DOCUMENTATION_BLOCK_RE = re.compile(
+    r'^documentation[ \t]*:[ \t]*(?:#.*)?\n((?:(?:[ \t]+.*|[ \t]*|#.*)(?:\n|$))*)', re.MULTILINE
+)
+
+
+def _is_single_block_mapping(content):
+    """Check, without parsing, that content is one block-style mapping document.
+    
+    Only leading comments, blank lines and a single ``---`` marker may precede
+    the first top-level key, and no further document boundaries may follow.
+    Anything else (lists, scalars, flow mappings, multi-document streams) is
+    left to the full YAML parser.
     
     Args:
-        yaml_path: Path object pointing to the YAML file
+        content: Raw YAML text
         
     Returns:
-        bool: True if file was modified, False if already complete
-        
-    Raises:
-        yaml.YAMLError: If YAML parsing fails
-        IOError: If file operations fail
+        bool: True if new top-level keys can safely be appended as text
     """
-    with open(yaml_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#') or (stripped == '---' and offset == 0):
+            offset += len(line)
+            continue
+        if not _BLOCK_KEY_RE.match(line):
+            return False
+        return _DOC_BOUNDARY_RE.search(content, offset) is None
+    # Empty document: only comments and/or a marker
+    return True
+
+
+def _is_truthy_scalar(text):
+    """Check that a single-line value loads as a non-empty scalar."""
+    try:
+        value = yaml.load(text, Loader=SafeLoader)
+    except yaml.YAMLError:
+        return False
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool) and bool(value)
+
+
+def _has_complete_metadata(content):
+    """Check, without parsing, that merge_metadata() would have nothing to add.
     
-    # Guard against None data and ensure it's a dictionary
-    if not data or not isinstance(data, dict):
-        data = {}
+    Looks for exactly one top-level ``version`` and one block-style
+    ``documentation`` mapping whose ``purpose`` and ``use_case`` children
+    all carry non-empty values on the key's line. The check is conservative:
+    anything it cannot vouch for (block scalars, flow mappings, duplicate
+    keys, multi-document streams) returns False and is left to the parser.
     
+    Args:
+        content: Raw YAML text
+        
+    Returns:
+        bool: True if the file's metadata is known to be complete
+    """
+    if not _is_single_block_mapping(content):
+        return False
+
+    versions = _VERSION_LINE_RE.findall(content)
+    if len(versions) != 1 or not _is_truthy_scalar(versions[0]):
+        return False
+
+    blocks = _DOCUMENTATION_BLOCK_RE.findall(content)
+    if len(blocks) != 1:
+        return False
+
+    # Children of documentation share the indentation of its first key
+    indent = None
+    for line in blocks[0].splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith('#'):
+            indent = line[:len(line) - len(line.lstrip())]
+            break
+    if not indent:
+        return False
+
+    for key in ('purpose', 'use_case'):
+        values = re.findall(rf'^{indent}{key}[ \t]*:(.*)$', blocks[0], re.MULTILINE)
+        if len(values) != 1 or not _is_truthy_scalar(values[0]):
+            return False
+
+    return True
+
+
+def _select_template(yaml_path):
+    """Find the metadata template for a framework file.
+    
+    Args:
+        yaml_path: Path object pointing to the YAML file
+        
+    Returns:
+        dict: Template with 'purpose', 'use_case' and 'version' keys
+    """
     # Extract framework base name
     filename = yaml_path.stem
     
-    # Try to find matching template
-    template = None
-    for key, meta in METADATA_TEMPLATES.items():
+    # Try to find matching template (longest key first)
+    for key in _TEMPLATE_KEYS:
         if key in filename:
-            template = meta
-            break
+            return METADATA_TEMPLATES[key]
     
     # If no exact match, generate generic metadata
-    if not template:
-        category = yaml_path.parent.name
-        template = {
-            'purpose': f'{filename.replace("-", " ").title()} framework for specialized AI reasoning',
-            'use_case': f'{category.replace("-", " ").title()} tasks requiring structured cognitive approach',
-            'version': '1.0'
-        }
+    category = yaml_path.parent.name
+    return {
+        'purpose': f'{filename.replace("-", " ").title()} framework for specialized AI reasoning',
+        'use_case': f'{category.replace("-", " ").title()} tasks requiring structured cognitive approach',
+        'version': '1.0'
+    }
+
+
+def merge_metadata(data, template):
+    """Fill missing metadata fields of parsed framework data in place.
     
-    # Check what's missing
+    Args:
+        data: Parsed framework dictionary
+        template: Metadata template from _select_template()
+        
+    Returns:
+        bool: True if any field was added
+    """
     changed = False
     doc = data.get('documentation', {}) if data else {}
     
@@ -186,22 +297,83 @@ def add_metadata_to_framework(yaml_path):
     
     if changed:
         data['documentation'] = doc
+    
+    return changed
+
+
+def add_metadata_to_framework(yaml_path):
+    """Add metadata to a framework YAML file if missing.
+    
+    When the file has neither a top-level ``version`` nor ``documentation``
+    key, the metadata block is appended as text, preserving the existing
+    formatting and comments. Files with partial metadata go through a full
+    load/dump so the missing fields can be merged.
+    
+    Args:
+        yaml_path: Path object pointing to the YAML file
+        
+    Returns:
+        bool: True if file was modified, False if already complete
         
+    Raises:
+        yaml.YAMLError: If YAML parsing fails
+        IOError: If file operations fail
+    """
+    with open(yaml_path, 'r', encoding='utf-8') as f:
+        st = os.fstat(f.fileno())
+        content = f.read()
+    
+    # Idempotent re-runs: metadata already complete, so skip parse and dump
+    if _has_complete_metadata(content):
+        return False
+    
+    template = _select_template(yaml_path)
+    
+    # Fast path: nothing to merge, so append without parsing the file
+    if not _METADATA_KEY_RE.search(content) and _is_single_block_mapping(content):
+        metadata = {
+            'version': template['version'],
+            'documentation': {
+                'purpose': template['purpose'],
+                'use_case': template['use_case'],
+            },
+        }
+        block = yaml.dump(metadata, Dumper=InsertionOrderDumper, default_flow_style=False, allow_unicode=True,
+                          sort_keys=False)
+        if content and not content.endswith('\n'):
+            block = '\n' + block
+        atomic_write(yaml_path, (content + block).encode('utf-8'))
+        return True
+    
+    data = load_yaml(yaml_path, content, SafeLoader, st)
+    
+    # Guard against None data and ensure it's a dictionary
+    if not data or not isinstance(data, dict):
+        data = {}
+    
+    if merge_metadata(data, template):
         # Write back to file
-        with open(yaml_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        with atomic_open(yaml_path) as f:
+            yaml.dump(data, f, Dumper=InsertionOrderDumper, encoding='utf-8', default_flow_style=False,
+                      allow_unicode=True, sort_keys=False)
         
         return True
     
     return False
 
+
 def main():
     """Process all framework files.
     
     Returns:
         int: Exit code (0 for success)
     """
-    import os
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Add missing framework metadata')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
     base_dir = Path(os.getenv('SCRATCHPAD_DIR', Path(__file__).parent.parent))
     frameworks_dir = base_dir / 'frameworks'
     
@@ -211,14 +383,29 @@ def main():
     print("Adding metadata to frameworks...")
     print()
     
-    for yaml_file in sorted(frameworks_dir.glob('**/*.yml')):
-        if add_metadata_to_framework(yaml_file):
+    cache = ComplianceCache(base_dir, 'add_framework_metadata')
+    
+    pending = {}
+    for yaml_file, st in iter_yaml(frameworks_dir, ('.yml',)):
+        if cache.is_compliant(yaml_file, st):
+            skipped_count += 1
+        else:
+            pending[yaml_file] = st
+    
+    # Workers finish in any order; report in file name order
+    results = dict(map_files(add_metadata_to_framework, pending, args.jobs))
+    for yaml_file in sorted(results):
+        if results[yaml_file]:
             print(f"✅ Updated: {yaml_file.name}")
+            cache.invalidate(yaml_file)
             updated_count += 1
         else:
             print(f"⏭️  Skipped: {yaml_file.name} (already complete)")
+            cache.mark_compliant(yaml_file, pending[yaml_file])
             skipped_count += 1
     
+    cache.save()
+    
     print()
     print(f"✨ Complete! Updated {updated_count} files, skipped {skipped_count}")
     return 0
@@ -9,9 +9,24 @@ Author: YAML Codex Agent
 Date: 2025-10-01
 """
 
+import mmap
+import re
 import sys
 from pathlib import Path
 
+try:
+    from scripts._atomic import atomic_write
+    from scripts._parallel import add_jobs_argument, map_files
+    from scripts._walk import iter_yaml
+except ImportError:  # executed directly rather than imported as scripts.*
+    from _atomic import atomic_write
+    from _parallel import add_jobs_argument, map_files
+    from _walk import iter_yaml
+
+# First non-whitespace byte of a file
+_FIRST_TOKEN_RE = re.compile(rb'\S')
+
+
 def add_doc_marker(filepath: Path) -> bool:
     """Add --- document marker to a YAML file if missing.
     
@@ -22,18 +37,29 @@ def add_doc_marker(filepath: Path) -> bool:
         bool: True if file was modified
     """
     try:
+        with open(filepath, 'rb') as f:
+            # Common case: the marker is already there, so only read the head
+            head = f.read(16)
+            if head.lstrip().startswith(b'---'):
+                return False
+            
+            # The head may end in whitespace or in a cut-off '-'/'--': find
+            # the first token in a read-only mapping of the file rather than
+            # decoding all of it
+            if len(head) == 16 and b'---'.startswith(head.lstrip()):
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    match = _FIRST_TOKEN_RE.search(mm)
+                    if match and mm[match.start():match.start() + 3] == b'---':
+                        return False
+        
+        # Only files that need the marker are decoded
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Check if already has document marker
-        if content.strip().startswith('---'):
-            return False
-        
         # Add marker
         new_content = '---\n' + content
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        atomic_write(filepath, new_content.encode('utf-8'))
         
         return True
         
@@ -43,18 +69,26 @@ def add_doc_marker(filepath: Path) -> bool:
 
 def main():
     """Main entry point."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Add missing YAML document markers')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
     base_dir = Path(__file__).parent.parent
     frameworks_dir = base_dir / 'frameworks'
     
-    yaml_files = list(frameworks_dir.glob('**/*.yml')) + list(frameworks_dir.glob('**/*.yaml'))
+    yaml_files = [path for path, _ in iter_yaml(frameworks_dir)]
     
     modified = 0
     skipped = 0
     
     print(f"Found {len(yaml_files)} YAML files")
     
-    for yaml_file in sorted(yaml_files):
-        if add_doc_marker(yaml_file):
+    # Workers finish in any order; report in file name order
+    results = dict(map_files(add_doc_marker, yaml_files, args.jobs))
+    for yaml_file in sorted(results):
+        if results[yaml_file]:
             print(f"✅ Added marker: {yaml_file.name}")
             modified += 1
         else:
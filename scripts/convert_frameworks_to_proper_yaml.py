@@ -6,10 +6,48 @@ This script converts frameworks that use XML embedded in string literals
 to proper YAML structures with nested dictionaries and lists.
 """
 
+import os
 import yaml
 import re
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Any
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; the regex parser handles everything
+    etree = None
+
+try:
+    from scripts._atomic import atomic_open
+    from scripts._dumper import InsertionOrderDumper
+    from scripts._parallel import add_jobs_argument, map_files
+    from scripts._parse_cache import load_yaml
+    from scripts._walk import iter_yaml
+    from scripts._yaml_cache import ComplianceCache
+except ImportError:  # executed directly rather than imported as scripts.*
+    from _atomic import atomic_open
+    from _dumper import InsertionOrderDumper
+    from _parallel import add_jobs_argument, map_files
+    from _parse_cache import load_yaml
+    from _walk import iter_yaml
+    from _yaml_cache import ComplianceCache
+
+# Patterns used on the XML-parsing hot path, compiled once at import
+_TAG_RE = re.compile(r'<([^/>]+)>(.*?)</\1>', re.DOTALL | re.IGNORECASE)
+_NESTED_RE = re.compile(r'<[^/>]+>.*?</[^>]+>', re.DOTALL)
+_SECTION_RE = re.compile(r'\[([^:]+):.*?\]')
+_WS_RE = re.compile(r'\n\s*\n\s*\n+')
+_TAG_NAME_SEP_RE = re.compile(r'[\s-]+')
+_INSTRUCTIONS_RE = re.compile(r'^(.+?)```', re.DOTALL)
+_SEPARATOR_RE = re.compile(r'-{3,}')
+# A block-style 'structure' key directly under the top-level 'framework' key
+# (line bodies exclude \r so CRLF lines match one way only, without backtracking)
+_CONVERTED_RE = re.compile(rb'^framework:[ \t]*\r?\n(?:(?:  [^\r\n]*)?\r?\n)*?  structure:', re.MULTILINE)
 
 
 def clean_text(text: str) -> str:
@@ -28,13 +66,13 @@ def clean_text(text: str) -> str:
         str: Cleaned and normalized text
     """
     # Remove excessive whitespace
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = _WS_RE.sub('\n\n', text)
     # Remove trailing/leading whitespace from each line
     lines = [line.rstrip() for line in text.split('\n')]
     return '\n'.join(lines).strip()
 
 
-def parse_scratchpad_sections(content: str) -> List[str]:
+def parse_scratchpad_sections(content: str) -> list[str]:
     """Extract scratchpad section names from bracketed format.
     
     Parses content using bracketed scratchpad format like:
@@ -46,14 +84,13 @@ def parse_scratchpad_sections(content: str) -> List[str]:
         content: String containing bracketed section markers
         
     Returns:
-        List[str]: List of section names found in the content
+        list[str]: List of section names found in the content
     """
-    pattern = r'\[([^:]+):.*?\]'
-    sections = re.findall(pattern, content)
+    sections = _SECTION_RE.findall(content)
     return [s.strip() for s in sections]
 
 
-def parse_xml_to_yaml(content: str) -> Dict[str, Any]:
+def parse_xml_to_yaml(content: str) -> dict[str, Any]:
     """
     Parse XML-like content and convert to YAML structure.
     
@@ -61,105 +98,204 @@ def parse_xml_to_yaml(content: str) -> Dict[str, Any]:
     Handles several formats:
     - Simple tags: <role>text</role> -> {"role": "text"}
     - Tags with spaces: <scratchpad flow>...</scratchpad flow> -> {"scratchpad_flow": {...}}
-    - Nested tags: Recursively processes nested XML structures
+    - Nested tags: Processes nested XML structures to any depth
     - Bracketed sections: [Section: description] format for scratchpad templates
     
     The function intelligently detects content types:
-    - Nested XML: Recursively parsed
+    - Nested XML: Parsed into nested dictionaries
     - Bracketed sections: Extracted as section lists
     - Plain text: Stored as string content
     
+    Well-formed markup is parsed with lxml when it is installed, which
+    builds the tree in linear time; anything lxml cannot represent exactly
+    (tags with spaces or attributes, entities, mismatched case, a tag
+    nested inside one of the same name) falls back to the regex parser, so
+    the output does not depend on whether lxml is installed.
+    
     Args:
         content: String containing XML-like markup to parse
         
     Returns:
-        Dict[str, Any]: Parsed YAML structure as nested dictionaries and lists
+        dict[str, Any]: Parsed YAML structure as nested dictionaries and lists
+    """
+    parsed = _parse_xml_tree(content)
+    if parsed is not None:
+        return parsed
+    return _parse_xml_regex(content)
+
+
+def _tag_key(tag_name: str) -> str:
+    """Normalize a tag name into a YAML key (lowercase, underscores)."""
+    return _TAG_NAME_SEP_RE.sub('_', tag_name.strip().lower())
+
+
+def _leaf_value(tag_content: str) -> Any:
+    """Convert the text of a tag without nested tags into a YAML value.
+    
+    Args:
+        tag_content: Stripped text between an opening and closing tag
+        
+    Returns:
+        Any: A bracketed-sections dict for scratchpad templates, else text
     """
+    # Check for bracketed sections (scratchpad format)
+    if '[' in tag_content and ']:' in tag_content:
+        sections = parse_scratchpad_sections(tag_content)
+        # Extract instructions before the template
+        instructions_match = _INSTRUCTIONS_RE.search(tag_content)
+        instructions = clean_text(instructions_match.group(1)) if instructions_match else None
+
+        value = {
+            "format": "bracketed_sections",
+            "sections": sections,
+        }
+        if instructions:
+            value["usage"] = instructions
+        value["template"] = clean_text(tag_content)
+        return value
+
+    # Simple text content
+    return clean_text(tag_content)
+
+
+def _untagged_text(text: str) -> str:
+    """Clean text found outside tags (instructions, separators)."""
+    remaining = _SEPARATOR_RE.sub('', text.strip()).strip()  # Remove separator lines
+    return clean_text(remaining)
+
+
+def _parse_xml_tree(content: str):
+    """Parse well-formed markup with lxml.
+    
+    Args:
+        content: String containing XML-like markup to parse
+        
+    Returns:
+        dict[str, Any] or None: Parsed structure, or None when lxml is
+        unavailable or the content needs the more lenient regex parser
+    """
+    # Entities, CDATA, comments and self-closing tags are kept verbatim by
+    # the regex parser, so leave them to it to produce identical output
+    if etree is None or '&' in content or '<!' in content or '<?' in content or '/>' in content:
+        return None
+
+    try:
+        root = etree.fromstring(f'<root>{content}</root>')
+    except etree.XMLSyntaxError:
+        return None
+
+    if len(root) == 0 or any(element.attrib for element in root.iter()):
+        return None
+
+    # The regex parser closes a tag at the first matching closing tag, so
+    # a tag nested in one of the same name parses differently there
+    if _has_same_tag_ancestor(root):
+        return None
+
+    return _element_to_dict(root)
+
+
+def _has_same_tag_ancestor(root) -> bool:
+    """Check whether any element is nested inside one with the same tag.
+    
+    Tags are compared case-insensitively, as the regex parser matches them.
+    """
+    stack = [(root, frozenset())]
+    while stack:
+        element, ancestors = stack.pop()
+        for child in element:
+            tag = child.tag.lower()
+            if tag in ancestors:
+                return True
+            stack.append((child, ancestors | {tag}))
+    return False
+
+
+def _element_to_dict(element) -> dict[str, Any]:
+    """Convert the children of an lxml element into a YAML structure."""
     result = {}
 
-    # Pattern to match XML-like tags (including tags with spaces)
-    tag_pattern = r'<([^/>]+)>(.*?)</\1>'
-
-    matches = re.findall(tag_pattern, content, re.DOTALL | re.IGNORECASE)
-
-    if not matches:
-        # No XML tags found, check for bracketed sections
-        if '[' in content and ']' in content:
-            sections = parse_scratchpad_sections(content)
-            if sections:
-                return {"sections": sections, "raw_format": clean_text(content)}
-        return {"content": clean_text(content)}
-
-    for tag_name, tag_content in matches:
-        # Clean tag name
-        clean_tag = tag_name.strip().lower()
-        clean_tag = re.sub(r'[\s-]+', '_', clean_tag)
-
-        tag_content = tag_content.strip()
-
-        # Check if content has nested tags
-        if re.search(r'<[^/>]+>.*?</[^>]+>', tag_content, re.DOTALL):
-            # Recursively parse nested content
-            nested = parse_xml_to_yaml(tag_content)
-            result[clean_tag] = nested
-        # Check for bracketed sections (scratchpad format)
-        elif '[' in tag_content and ']:' in tag_content:
-            sections = parse_scratchpad_sections(tag_content)
-            # Extract instructions before the template
-            instructions_match = re.search(r'^(.+?)```', tag_content, re.DOTALL)
-            instructions = clean_text(instructions_match.group(1)) if instructions_match else None
-
-            result[clean_tag] = {
-                "format": "bracketed_sections",
-                "sections": sections,
-            }
-            if instructions:
-                result[clean_tag]["usage"] = instructions
-            result[clean_tag]["template"] = clean_text(tag_content)
+    for child in element:
+        if len(child):
+            result[_tag_key(child.tag)] = _element_to_dict(child)
         else:
-            # Simple text content
-            result[clean_tag] = clean_text(tag_content)
-
-    # Handle content outside tags (instructions, separators)
-    remaining = re.sub(tag_pattern, '', content, flags=re.DOTALL).strip()
-    remaining = re.sub(r'-{3,}', '', remaining).strip()  # Remove separator lines
-    remaining = clean_text(remaining)
+            result[_tag_key(child.tag)] = _leaf_value((child.text or '').strip())
 
+    # Text between child elements plays the role of content outside tags
+    remaining = _untagged_text(''.join([element.text or ''] + [child.tail or '' for child in element]))
     if remaining:
         result["instructions"] = remaining
 
     return result
 
 
-def convert_framework(yaml_file: Path) -> bool:
-    """
-    Convert a single framework file to proper YAML structure.
-    
-    This function checks if a framework file needs conversion from the legacy
-    XML-embedded format to modern structured YAML. It:
-    - Loads the existing YAML file
-    - Checks for framework.content field with XML or bracketed content
-    - Parses the content into structured YAML
-    - Updates the framework with a 'structure' field
-    - Preserves original content in 'legacy_content' for reference
-    - Writes back with proper YAML formatting including document start marker
+def _parse_xml_regex(content: str) -> dict[str, Any]:
+    """Parse XML-like markup with regular expressions.
     
-    Files that don't need conversion (already converted or no XML content)
-    are skipped without modification.
+    Lenient fallback for parse_xml_to_yaml: accepts tags containing spaces,
+    case-insensitive closing tags and stray markup.
     
     Args:
-        yaml_file: Path object pointing to the framework YAML file
+        content: String containing XML-like markup to parse
         
     Returns:
-        bool: True if conversion was performed, False if file was skipped
-        
-    Raises:
-        yaml.YAMLError: If YAML parsing or dumping fails
-        IOError: If file read/write operations fail
+        dict[str, Any]: Parsed YAML structure as nested dictionaries and lists
     """
-    with open(yaml_file, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+    root = {}
+    # Worklist of (markup, dict to fill) so nesting depth is not bounded by
+    # the interpreter's recursion limit
+    stack = [(content, root)]
+
+    while stack:
+        text, result = stack.pop()
+
+        # Match XML-like tags (including tags with spaces)
+        matches = _TAG_RE.findall(text)
+
+        if not matches:
+            # No XML tags found, check for bracketed sections
+            if '[' in text and ']' in text:
+                sections = parse_scratchpad_sections(text)
+                if sections:
+                    result["sections"] = sections
+                    result["raw_format"] = clean_text(text)
+                    continue
+            result["content"] = clean_text(text)
+            continue
+
+        for tag_name, tag_content in matches:
+            tag_content = tag_content.strip()
+
+            # Check if content has nested tags
+            if _NESTED_RE.search(tag_content):
+                # Parse nested content into a placeholder filled later
+                nested = result[_tag_key(tag_name)] = {}
+                stack.append((tag_content, nested))
+            else:
+                result[_tag_key(tag_name)] = _leaf_value(tag_content)
+
+        # Handle content outside tags (instructions, separators)
+        remaining = _untagged_text(_TAG_RE.sub('', text))
+
+        if remaining:
+            result["instructions"] = remaining
+
+    return root
 
+
+def convert_framework_data(data: Any) -> bool:
+    """
+    Convert parsed framework data to proper YAML structure in place.
+    
+    Moves XML-embedded or bracketed framework.content into a parsed
+    'structure' field, keeping the original text as 'legacy_content'.
+    
+    Args:
+        data: Parsed YAML document
+        
+    Returns:
+        bool: True if data was converted, False if no conversion was needed
+    """
     if not isinstance(data, dict):
         return False
 
@@ -174,15 +310,13 @@ def convert_framework(yaml_file: Path) -> bool:
         return False
 
     # Check if content contains XML-like tags or needs conversion
-    has_xml = re.search(r'<[^/>]+>.*?</[^>]+>', content, re.DOTALL)
+    has_xml = _NESTED_RE.search(content)
     has_brackets = '[' in content and ']:' in content
 
     if not (has_xml or has_brackets):
         # Plain content, no conversion needed
         return False
 
-    print(f"Converting: {yaml_file.name}")
-
     # Parse the content to YAML structure
     parsed = parse_xml_to_yaml(content)
 
@@ -193,11 +327,58 @@ def convert_framework(yaml_file: Path) -> bool:
     # Remove old content key
     del data['framework']['content']
 
-    # Write back as proper YAML
-    with open(yaml_file, 'w', encoding='utf-8') as f:
+    return True
+
+
+def convert_framework(yaml_file: Path) -> bool:
+    """
+    Convert a single framework file to proper YAML structure.
+    
+    This function checks if a framework file needs conversion from the legacy
+    XML-embedded format to modern structured YAML. It:
+    - Loads the existing YAML file
+    - Checks for framework.content field with XML or bracketed content
+    - Parses the content into structured YAML
+    - Updates the framework with a 'structure' field
+    - Preserves original content in 'legacy_content' for reference
+    - Writes back with proper YAML formatting including document start marker
+    
+    Files that don't need conversion (already converted or no XML content)
+    are skipped without modification.
+    
+    Args:
+        yaml_file: Path object pointing to the framework YAML file
+        
+    Returns:
+        bool: True if conversion was performed, False if file was skipped
+        
+    Raises:
+        yaml.YAMLError: If YAML parsing or dumping fails
+        IOError: If file read/write operations fail
+    """
+    with open(yaml_file, 'rb') as f:
+        st = os.fstat(f.fileno())
+        raw = f.read()
+
+    # Already converted files are recognisable from the text alone
+    if _CONVERTED_RE.search(raw):
+        return False
+
+    data = load_yaml(yaml_file, raw, SafeLoader, st)
+
+    if not convert_framework_data(data):
+        return False
+
+    print(f"Converting: {yaml_file.name}")
+
+    # Write back as proper YAML, letting the emitter stream encoded chunks
+    # straight to the binary handle rather than building the document first
+    with atomic_open(yaml_file) as f:
         # Add document start marker
-        f.write('---\n')
+        f.write(b'---\n')
         yaml.dump(data, f,
+                  Dumper=InsertionOrderDumper,
+                  encoding='utf-8',
                   default_flow_style=False,
                   allow_unicode=True,
                   sort_keys=False,
@@ -217,13 +398,20 @@ def main():
     The function:
     - Validates the frameworks directory exists
     - Recursively finds all .yml files
-    - Converts each file that needs conversion
+    - Converts each file that needs conversion across a process pool
     - Provides summary statistics of conversion results
     
     Returns:
         int: Exit code (0 for success, 1 for error)
     """
-    frameworks_dir = Path(__file__).parent.parent / 'frameworks'
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert XML-embedded frameworks to structured YAML')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    frameworks_dir = base_dir / 'frameworks'
 
     if not frameworks_dir.exists():
         print(f"Error: {frameworks_dir} does not exist")
@@ -231,13 +419,25 @@ def main():
 
     converted = 0
     skipped = 0
+    cache = ComplianceCache(base_dir, 'convert_frameworks_to_proper_yaml')
+
+    pending = {}
+    for yaml_file, st in iter_yaml(frameworks_dir, ('.yml',)):
+        if cache.is_compliant(yaml_file, st):
+            skipped += 1
+        else:
+            pending[yaml_file] = st
 
-    for yaml_file in sorted(frameworks_dir.glob('**/*.yml')):
-        if convert_framework(yaml_file):
+    for yaml_file, was_converted in map_files(convert_framework, pending, args.jobs):
+        if was_converted:
+            cache.invalidate(yaml_file)
             converted += 1
         else:
+            cache.mark_compliant(yaml_file, pending[yaml_file])
             skipped += 1
 
+    cache.save()
+
     print("\nConversion complete:")
     print(f"  Converted: {converted} files")
     print(f"  Skipped: {skipped} files")
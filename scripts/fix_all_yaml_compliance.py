@@ -14,34 +14,63 @@ Author: YAML Codex Agent
 Date: 2025-10-01
 """
 
+import os
 import yaml
 import re
 import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Any
 import json
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    from scripts._atomic import atomic_write
+    from scripts._parallel import add_jobs_argument, map_files
+    from scripts._parse_cache import load_yaml
+    from scripts._walk import iter_yaml
+    from scripts._yaml_cache import ComplianceCache
+except ImportError:  # executed directly rather than imported as scripts.*
+    from _atomic import atomic_write
+    from _parallel import add_jobs_argument, map_files
+    from _parse_cache import load_yaml
+    from _walk import iter_yaml
+    from _yaml_cache import ComplianceCache
+
+# Double-quoted content fields containing backslash escapes
+_ESCAPE_RE = re.compile(r'(\s+content:\s*)"([^"]*(?:\\[nt"])[^"]*)"', re.MULTILINE | re.DOTALL)
+# Substrings _ESCAPE_RE requires; without any of them it cannot match
+_ESCAPE_SEQUENCES = ('\\n', '\\t', '\\"')
+
+# Single-character substitution table for NBSP (U+00A0) removal
+_NBSP_TABLE = str.maketrans({'\u00a0': ' '})
+
+
 class YAMLRemediator:
     """Comprehensive YAML 1.2.2 compliance remediation tool."""
     
-    # Values that need quoting to avoid type coercion
-    AMBIGUOUS_VALUES = {
-        'YES', 'Yes', 'yes', 'NO', 'No', 'no',
-        'ON', 'On', 'on', 'OFF', 'Off', 'off',
-        'TRUE', 'True', 'true', 'FALSE', 'False', 'false',
-        'Y', 'y', 'N', 'n', '~', 'null', 'NULL', 'Null'
-    }
+    # Values that need quoting to avoid type coercion (compared lowercased)
+    AMBIGUOUS_VALUES = frozenset({
+        'yes', 'no', 'on', 'off', 'true', 'false', 'y', 'n', '~', 'null'
+    })
     
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, buffer_log: bool = False):
         """Initialize the remediator.
         
         Args:
             verbose: If True, print detailed progress information
+            buffer_log: If True, collect log messages in self.messages
+                instead of printing them (used by worker processes)
         """
         self.verbose = verbose
+        self.messages = [] if buffer_log else None
         self.stats = {
             'files_processed': 0,
             'files_fixed': 0,
+            'files_cached': 0,
             'doc_markers_added': 0,
             'escapes_fixed': 0,
             'values_quoted': 0,
@@ -51,9 +80,25 @@ class YAMLRemediator:
     
     def log(self, message: str) -> None:
         """Log a message if verbose mode is enabled."""
-        if self.verbose:
+        if not self.verbose:
+            return
+        if self.messages is not None:
+            self.messages.append(message)
+        else:
             print(message)
     
+    def merge_stats(self, stats: dict[str, Any]) -> None:
+        """Accumulate a stats delta produced by another remediator.
+        
+        Args:
+            stats: Stats dictionary from a worker's YAMLRemediator
+        """
+        for key, value in stats.items():
+            if isinstance(value, list):
+                self.stats[key].extend(value)
+            else:
+                self.stats[key] += value
+    
     def fix_yaml_file(self, filepath: Path) -> bool:
         """Fix all compliance issues in a single YAML file.
         
@@ -66,22 +111,26 @@ class YAMLRemediator:
         self.log(f"Processing: {filepath.name}")
         
         try:
-            # Read the original file
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Read the original bytes; kept to detect whether we made changes
+            with open(filepath, 'rb') as f:
+                st = os.fstat(f.fileno())
+                original_bytes = f.read()
+            content = original_bytes.decode('utf-8')
             
-            # Track if we made changes
-            original_content = content
-            
-            # Step 1: Remove NBSP characters (U+00A0)
-            if '\u00a0' in content:
-                content = content.replace('\u00a0', ' ')
+            # Step 1: Remove NBSP characters (U+00A0), probed on the raw bytes
+            has_nbsp = b'\xc2\xa0' in original_bytes
+            if has_nbsp:
+                content = content.translate(_NBSP_TABLE)
                 self.stats['nbsp_removed'] += 1
                 self.log("  ✓ Removed NBSP characters")
             
-            # Step 2: Parse YAML to understand structure
+            # Step 2: Parse YAML to understand structure; unmodified
+            # contents can come from the parsed-YAML sidecar cache
             try:
-                data = yaml.safe_load(content)
+                if has_nbsp:
+                    data = yaml.load(content, Loader=SafeLoader)
+                else:
+                    data = load_yaml(filepath, content, SafeLoader, st)
                 if not data:
                     data = {}
             except yaml.YAMLError as e:
@@ -111,9 +160,9 @@ class YAMLRemediator:
             new_content = self._fix_escaped_content(new_content)
             
             # Write back if changed
-            if new_content != original_content:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+            new_bytes = new_content.encode('utf-8')
+            if new_bytes != original_bytes:
+                atomic_write(filepath, new_bytes)
                 self.stats['files_fixed'] += 1
                 self.log(f"  ✅ Fixed: {filepath.name}")
                 return True
@@ -129,7 +178,7 @@ class YAMLRemediator:
         finally:
             self.stats['files_processed'] += 1
     
-    def _format_dict(self, data: Dict[str, Any], indent: int) -> List[str]:
+    def _format_dict(self, data: dict[str, Any], indent: int) -> list[str]:
         """Format a dictionary as YAML lines.
         
         Args:
@@ -223,7 +272,7 @@ class YAMLRemediator:
             True if value needs quoting
         """
         # Check for ambiguous values
-        if value in self.AMBIGUOUS_VALUES:
+        if value.lower() in self.AMBIGUOUS_VALUES:
             return True
         
         # Check for special characters
@@ -272,8 +321,9 @@ class YAMLRemediator:
         Returns:
             Fixed content
         """
-        # Pattern to find content fields with escapes
-        pattern = r'(\s+content:\s*)"([^"]*(?:\\[nt"])[^"]*)"'
+        # Most files carry no escape sequences at all; skip the regex scan
+        if not any(escape in content for escape in _ESCAPE_SEQUENCES):
+            return content
         
         def replace_escapes(match):
             indent = match.group(1)
@@ -294,24 +344,47 @@ class YAMLRemediator:
             return '\n'.join(lines)
         
         # Apply the fix
-        content = re.sub(pattern, replace_escapes, content, flags=re.MULTILINE | re.DOTALL)
+        content = _ESCAPE_RE.sub(replace_escapes, content)
         
         return content
     
-    def process_directory(self, directory: Path) -> None:
+    def process_directory(self, directory: Path, jobs: int | None = None) -> None:
         """Process all YAML files in a directory recursively.
         
+        Files are remediated in parallel worker processes; each worker
+        returns its stats delta, which is merged into self.stats here.
+        
         Args:
             directory: Directory to process
+            jobs: Worker process count (defaults to the number of CPUs)
         """
-        yaml_files = list(directory.glob('**/*.yml')) + list(directory.glob('**/*.yaml'))
+        yaml_files = list(iter_yaml(directory))
         
         self.log("\n🔧 YAML Compliance Remediation")
         self.log(f"Found {len(yaml_files)} YAML files to process\n")
         
-        for yaml_file in sorted(yaml_files):
-            self.fix_yaml_file(yaml_file)
+        cache = ComplianceCache(Path(__file__).parent.parent, 'fix_all_yaml_compliance')
+        
+        pending = {}
+        for yaml_file, st in yaml_files:
+            if cache.is_compliant(yaml_file, st):
+                self.stats['files_cached'] += 1
+            else:
+                pending[yaml_file] = st
+        
+        # Workers finish in any order; log and merge in file name order
+        results = dict(map_files(remediate_file, pending, jobs, (self.verbose,)))
+        for yaml_file in sorted(results):
+            result = results[yaml_file]
+            for message in result['messages']:
+                self.log(message)
+            self.merge_stats(result['stats'])
+            if result['fixed']:
+                cache.invalidate(yaml_file)
+            elif not result['stats']['errors']:
+                cache.mark_compliant(yaml_file, pending[yaml_file])
         
+        cache.save()
         self.print_summary()
     
     def print_summary(self) -> None:
@@ -321,6 +394,7 @@ class YAMLRemediator:
         print("="*50)
         print(f"Files Processed: {self.stats['files_processed']}")
         print(f"Files Fixed: {self.stats['files_fixed']}")
+        print(f"Files Skipped (unchanged since last run): {self.stats['files_cached']}")
         print(f"Document Markers Added: {self.stats['doc_markers_added']}")
         print(f"Escaped Sequences Fixed: {self.stats['escapes_fixed']}")
         print(f"Values Quoted: {self.stats['values_quoted']}")
@@ -341,6 +415,26 @@ class YAMLRemediator:
         print(f"\n📄 Detailed report saved to: {stats_file}")
 
 
+def remediate_file(filepath: Path, verbose: bool = True) -> dict[str, Any]:
+    """Fix a single file with a fresh remediator (process-pool worker).
+    
+    Args:
+        filepath: Path to the YAML file to fix
+        verbose: If True, collect detailed progress messages
+        
+    Returns:
+        Dict with 'fixed' (bool), 'stats' (the file's stats delta) and
+        'messages' (buffered log lines for the parent to print)
+    """
+    remediator = YAMLRemediator(verbose=verbose, buffer_log=True)
+    fixed = remediator.fix_yaml_file(filepath)
+    return {
+        'fixed': fixed,
+        'stats': remediator.stats,
+        'messages': remediator.messages,
+    }
+
+
 def main():
     """Main entry point for the remediation script."""
     import argparse
@@ -357,6 +451,7 @@ def main():
         action='store_true',
         help='Suppress verbose output'
     )
+    add_jobs_argument(parser)
     
     args = parser.parse_args()
     
@@ -370,7 +465,7 @@ def main():
     
     # Run remediation
     remediator = YAMLRemediator(verbose=not args.quiet)
-    remediator.process_directory(target_dir)
+    remediator.process_directory(target_dir, jobs=args.jobs)
     
     return 0
 
@@ -9,9 +9,57 @@ Author: Warp AI Agent
 Date: 2025-10-01
 """
 
-import yaml
+import os
 from pathlib import Path
 
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
+try:
+    from scripts._atomic import atomic_write
+    from scripts._parallel import add_jobs_argument, map_files
+    from scripts._parse_cache import load_yaml
+    from scripts._walk import iter_yaml
+except ImportError:  # executed directly rather than imported as scripts.*
+    from _atomic import atomic_write
+    from _parallel import add_jobs_argument, map_files
+    from _parse_cache import load_yaml
+    from _walk import iter_yaml
+
+
+# Custom string classes for different formatting needs
+class LiteralStr(str):
+    """String subclass for literal block scalar style (|)."""
+    pass
+
+
+class QuotedStr(str):
+    """String subclass for double-quoted style."""
+    pass
+
+
+# Configure YAML dumper with custom representers
+class CustomDumper(SafeDumper):
+    pass
+
+
+def literal_str_representer(dumper, data):
+    return dumper.represent_scalar('tag:yaml.org,2002:str', str(data), style='|')
+
+
+def quoted_str_representer(dumper, data):
+    return dumper.represent_scalar('tag:yaml.org,2002:str', str(data), style='"')
+
+
+CustomDumper.add_representer(LiteralStr, literal_str_representer)
+CustomDumper.add_representer(QuotedStr, quoted_str_representer)
+
+
 def fix_yaml_file(yaml_path):
     """Fix a single YAML file to use literal block scalars.
     
@@ -26,40 +74,17 @@ def fix_yaml_file(yaml_path):
         IOError: If file operations fail
     """
     # Read file once and store content to avoid race conditions
-    with open(yaml_path, 'r', encoding='utf-8') as f:
+    with open(yaml_path, 'rb') as f:
+        st = os.fstat(f.fileno())
         original_content = f.read()
     
     # Parse the content
-    data = yaml.safe_load(original_content)
+    data = load_yaml(yaml_path, original_content, SafeLoader, st)
     
     # Guard against None data and ensure it's a dictionary
     if not data or not isinstance(data, dict):
         return False
     
-    # Prepare to preserve all original keys and format framework.content as a literal block scalar
-    
-    # Custom string classes for different formatting needs
-    class LiteralStr(str): 
-        """String subclass for literal block scalar style (|)."""
-        pass
-    
-    class QuotedStr(str):
-        """String subclass for double-quoted style."""
-        pass
-    
-    # Configure YAML dumper with custom representers
-    class CustomDumper(yaml.SafeDumper):
-        pass
-    
-    def literal_str_representer(dumper, data):
-        return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
-    
-    def quoted_str_representer(dumper, data):
-        return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='"')
-    
-    CustomDumper.add_representer(LiteralStr, literal_str_representer)
-    CustomDumper.add_representer(QuotedStr, quoted_str_representer)
-
     # Copy all original data, use safe access, and update only necessary fields
     new_data = dict(data)  # shallow copy preserves unknown keys
     new_data['name'] = QuotedStr(data.get('name', ''))
@@ -84,13 +109,14 @@ def fix_yaml_file(yaml_path):
     framework_new['content'] = LiteralStr(content)
     new_data['framework'] = framework_new
 
-    # Serialize the new YAML content to a string
-    new_yaml_str = yaml.dump(new_data, Dumper=CustomDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    # Serialize straight to UTF-8 so the comparison and the write need no
+    # further encode pass
+    new_yaml = yaml.dump(new_data, Dumper=CustomDumper, default_flow_style=False, sort_keys=False,
+                         allow_unicode=True, encoding='utf-8')
     
     # Only write if the content has changed (compare with stored original)
-    if original_content != new_yaml_str:
-        with open(yaml_path, 'w', encoding='utf-8') as f:
-            f.write(new_yaml_str)
+    if original_content != new_yaml:
+        atomic_write(yaml_path, new_yaml)
         return True
     return False
 
@@ -100,7 +126,12 @@ def main():
     Returns:
         int: Exit code (0 for success)
     """
-    import os
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Fix YAML formatting to use literal block scalars')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
     base_dir = Path(os.getenv('SCRATCHPAD_DIR', Path(__file__).parent.parent))
     frameworks_dir = base_dir / 'frameworks'
     
@@ -110,8 +141,10 @@ def main():
     print("Fixing YAML formatting to use literal block scalars...")
     print()
     
-    for yaml_file in sorted(frameworks_dir.glob('**/*.yml')):
-        if fix_yaml_file(yaml_file):
+    # Workers finish in any order; report in file name order
+    results = dict(map_files(fix_yaml_file, (path for path, _ in iter_yaml(frameworks_dir, ('.yml',))), args.jobs))
+    for yaml_file in sorted(results):
+        if results[yaml_file]:
             print(f"✅ Fixed: {yaml_file.name}")
             fixed_count += 1
         else:
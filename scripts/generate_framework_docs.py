@@ -9,107 +9,155 @@ Author: Warp AI Agent
 Date: 2025-10-01
 """
 
+import io
+import os
 import yaml
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
 
-def load_framework(yaml_path):
-    """Load and parse a YAML framework file.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    from scripts._parallel import add_jobs_argument, map_files
+    from scripts._parse_cache import load_yaml
+    from scripts._walk import iter_yaml
+except ImportError:  # executed directly rather than imported as scripts.*
+    from _parallel import add_jobs_argument, map_files
+    from _parse_cache import load_yaml
+    from _walk import iter_yaml
+
+
+def _load_framework_result(yaml_path):
+    """Parse one framework file, returning (data, error) for the process pool.
+    
+    The raw bytes go straight to the (C) loader, which does its own UTF-8
+    decoding; unchanged files are served from the parsed-YAML sidecar.
+    Read and parse errors are returned rather than raised and re-raised in
+    the parent, so callers report them per file as before.
+    """
+    try:
+        with open(yaml_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            return load_yaml(yaml_path, f.read(), SafeLoader, st), None
+    except (yaml.YAMLError, OSError, UnicodeDecodeError) as e:
+        return None, e
+
+def _load_frameworks(yaml_files, jobs):
+    """Load framework files, across a process pool when jobs > 1.
     
     Args:
-        yaml_path: Path to the YAML framework file
+        yaml_files: List of YAML framework paths
+        jobs: Worker process count
         
     Returns:
-        dict: Parsed YAML data structure
+        dict: Path -> (data, error) for every file
+    """
+    return dict(map_files(_load_framework_result, yaml_files, jobs))
+
+def _collect_frameworks(base_dir, jobs=1):
+    """Find and parse every framework file once.
+    
+    Args:
+        base_dir: Base directory path containing frameworks subdirectory
+        jobs: Worker processes used to parse the framework files
         
-    Raises:
-        yaml.YAMLError: If YAML parsing fails
-        FileNotFoundError: If file doesn't exist
+    Returns:
+        list: (path, data, error) for every framework file
     """
-    with open(yaml_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    frameworks_dir = Path(base_dir) / 'frameworks'
+    yaml_files = []
+    if frameworks_dir.is_dir():
+        yaml_files = [path for path, _ in iter_yaml(frameworks_dir, ('.yml',))]
+    loaded = _load_frameworks(yaml_files, jobs)
+    return [(yaml_file, *loaded[yaml_file]) for yaml_file in yaml_files]
 
-def generate_framework_summary(base_dir):
+def generate_framework_summary(base_dir, jobs=1, frameworks=None):
     """Generate markdown summary of all frameworks.
     
     Args:
         base_dir: Base directory path containing frameworks subdirectory
+        jobs: Worker processes used to parse the framework files
+        frameworks: Result of _collect_frameworks, to reuse an earlier parse
         
     Returns:
         str: Formatted markdown documentation
     """
-    frameworks_dir = Path(base_dir) / 'frameworks'
+    if frameworks is None:
+        frameworks = _collect_frameworks(base_dir, jobs)
     
-    # Organize by category
+    # Render each framework block as it is read; (name, block) per category
     categories = defaultdict(list)
     
-    for yaml_file in frameworks_dir.glob('**/*.yml'):
+    for yaml_file, data, error in frameworks:
         try:
-            data = load_framework(yaml_file)
-            category = yaml_file.parent.name
+            if error is not None:
+                raise error
+            doc = data.get('documentation', {})
+            name = data.get('name', yaml_file.stem)
             
-            framework_info = {
-                'name': data.get('name', yaml_file.stem),
-                'version': data.get('version', 'N/A'),
-                'file': yaml_file.name,
-                'purpose': data.get('documentation', {}).get('purpose', 'No description'),
-                'use_case': data.get('documentation', {}).get('use_case', 'No use case specified'),
-                'character_count': data.get('documentation', {}).get('character_count', 'Unknown'),
-            }
+            purpose = doc.get('purpose', 'No description')
+            purpose = f"**Purpose**: {purpose}\n\n" if purpose and purpose != 'No description' else ''
+            
+            use_case = doc.get('use_case', 'No use case specified')
+            use_case = f"**Use Cases**: {use_case}\n\n" if use_case and use_case != 'No use case specified' else ''
+            
+            # One string per framework block
+            block = (
+                f"### {name}\n\n"
+                f"**File**: `{yaml_file.name}` | **Version**: {data.get('version', 'N/A')} "
+                f"| **Size**: ~{doc.get('character_count', 'Unknown')} chars\n\n"
+                f"{purpose}{use_case}"
+                "---\n\n"
+            )
             
-            categories[category].append(framework_info)
+            categories[yaml_file.parent.name].append((name, block))
         except Exception as e:
             print(f"Warning: Could not process {yaml_file}: {e}")
     
     # Generate markdown
-    md_lines = [
-        "# Framework Quick Reference\n",
-        "_Auto-generated documentation from YAML metadata_\n",
-        f"**Last Updated**: {datetime.now().isoformat()}\n",
+    md = io.StringIO()
+    md.write(
+        "# Framework Quick Reference\n"
+        "_Auto-generated documentation from YAML metadata_\n"
+        f"**Last Updated**: {datetime.now().isoformat()}\n"
         "---\n\n"
-    ]
+    )
     
     # Table of contents
-    md_lines.append("## Table of Contents\n\n")
-    for category in sorted(categories.keys()):
-        md_lines.append(f"- [{category.title()}](#{category})\n")
-    md_lines.append("\n---\n\n")
+    toc = ''.join(f"- [{category.title()}](#{category})\n" for category in sorted(categories.keys()))
+    md.write(f"## Table of Contents\n\n{toc}\n---\n\n")
     
     # Framework details by category
     for category in sorted(categories.keys()):
-        md_lines.append(f"## {category.title()}\n\n")
-        
-        for fw in sorted(categories[category], key=lambda x: x['name']):
-            md_lines.append(f"### {fw['name']}\n\n")
-            md_lines.append(f"**File**: `{fw['file']}` | **Version**: {fw['version']} | **Size**: ~{fw['character_count']} chars\n\n")
-            
-            if fw['purpose'] and fw['purpose'] != 'No description':
-                md_lines.append(f"**Purpose**: {fw['purpose']}\n\n")
-            
-            if fw['use_case'] and fw['use_case'] != 'No use case specified':
-                md_lines.append(f"**Use Cases**: {fw['use_case']}\n\n")
-            
-            md_lines.append("---\n\n")
+        md.write(f"## {category.title()}\n\n")
+        md.writelines(block for _, block in sorted(categories[category], key=lambda fw: fw[0]))
     
-    return ''.join(md_lines)
+    return md.getvalue()
 
-def generate_comparison_table(base_dir):
+def generate_comparison_table(base_dir, jobs=1, frameworks=None):
     """Generate a comparison table of all frameworks.
     
     Args:
         base_dir: Base directory path containing frameworks subdirectory
+        jobs: Worker processes used to parse the framework files
+        frameworks: Result of _collect_frameworks, to reuse an earlier parse
         
     Returns:
         str: Markdown-formatted comparison table
     """
-    frameworks_dir = Path(base_dir) / 'frameworks'
+    if frameworks is None:
+        frameworks = _collect_frameworks(base_dir, jobs)
     
-    frameworks = []
-    for yaml_file in frameworks_dir.glob('**/*.yml'):
+    rows = []
+    for yaml_file, data, error in frameworks:
         try:
-            data = load_framework(yaml_file)
-            frameworks.append({
+            if error is not None:
+                raise error
+            rows.append({
                 'name': data.get('name', yaml_file.stem),
                 'category': yaml_file.parent.name,
                 'version': data.get('version', ''),
@@ -120,18 +168,19 @@ def generate_comparison_table(base_dir):
             continue
     
     # Sort by category then name
-    frameworks.sort(key=lambda x: (x['category'], x['name']))
+    rows.sort(key=lambda x: (x['category'], x['name']))
     
-    md_lines = [
-        "# Framework Comparison Table\n\n",
-        "| Framework | Category | Version | Size (chars) |\n",
+    md = io.StringIO()
+    md.write(
+        "# Framework Comparison Table\n\n"
+        "| Framework | Category | Version | Size (chars) |\n"
         "|-----------|----------|---------|-------------|\n"
-    ]
+    )
     
-    for fw in frameworks:
-        md_lines.append(f"| {fw['name']} | {fw['category'].title()} | `{fw['version']}` | {fw['chars']} |\n")
+    for fw in rows:
+        md.write(f"| {fw['name']} | {fw['category'].title()} | `{fw['version']}` | {fw['chars']} |\n")
     
-    return ''.join(md_lines)
+    return md.getvalue()
 
 def main():
     """Generate all documentation.
@@ -139,21 +188,30 @@ def main():
     Returns:
         int: Exit code (0 for success)
     """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate framework documentation')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
     base_dir = Path(__file__).parent.parent
     output_dir = base_dir / 'docs'
     output_dir.mkdir(exist_ok=True)
     
     print("Generating framework documentation...")
     
+    # Parse once for both documents
+    frameworks = _collect_frameworks(base_dir, args.jobs)
+    
     # Generate summary
-    summary = generate_framework_summary(base_dir)
+    summary = generate_framework_summary(base_dir, frameworks=frameworks)
     summary_path = output_dir / 'FRAMEWORK_REFERENCE.md'
     with open(summary_path, 'w', encoding='utf-8') as f:
         f.write(summary)
     print(f"✅ Generated: {summary_path}")
     
     # Generate comparison table
-    comparison = generate_comparison_table(base_dir)
+    comparison = generate_comparison_table(base_dir, frameworks=frameworks)
     comparison_path = output_dir / 'FRAMEWORK_COMPARISON.md'
     with open(comparison_path, 'w', encoding='utf-8') as f:
         f.write(comparison)
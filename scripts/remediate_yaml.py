@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Single-Pass YAML Remediation
+
+Applies the fixes of the individual remediation scripts in one traversal,
+reading and parsing each framework file exactly once:
+
+- Document start marker (add_yaml_doc_markers.py)
+- NBSP removal, version quoting and escaped multi-line strings
+  (fix_all_yaml_compliance.py)
+- XML-to-structure conversion (convert_frameworks_to_proper_yaml.py)
+- Missing metadata (add_framework_metadata.py)
+
+Text-only fixes (marker, NBSP) are applied to the raw bytes; structural fixes
+operate on the parsed tree, which is dumped once if anything changed.
+Multi-line strings are emitted as literal block scalars rather than escaped
+double-quoted strings.
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    from scripts._atomic import atomic_write
+    from scripts._dumper import InsertionOrderDumper
+    from scripts._parallel import add_jobs_argument, map_files
+    from scripts._parse_cache import load_yaml
+    from scripts._walk import iter_yaml
+    from scripts._yaml_cache import ComplianceCache
+    from scripts.add_framework_metadata import _select_template, merge_metadata
+    from scripts.convert_frameworks_to_proper_yaml import convert_framework_data
+except ImportError:  # executed directly rather than imported as scripts.*
+    from _atomic import atomic_write
+    from _dumper import InsertionOrderDumper
+    from _parallel import add_jobs_argument, map_files
+    from _parse_cache import load_yaml
+    from _walk import iter_yaml
+    from _yaml_cache import ComplianceCache
+    from add_framework_metadata import _select_template, merge_metadata
+    from convert_frameworks_to_proper_yaml import convert_framework_data
+
+NBSP = b'\xc2\xa0'
+# A double-quoted scalar containing a \n escape, within one physical line
+_ESCAPED_NEWLINE_RE = re.compile(rb'"(?:[^"\\\n]|\\.)*?\\n')
+# Fixes applied to the parsed tree; any of them requires a re-dump
+_TREE_FIXES = ('version', 'structure', 'metadata', 'escapes')
+
+
+class RemediationDumper(InsertionOrderDumper):
+    """Safe dumper emitting multi-line strings as literal block scalars."""
+
+
+def _str_representer(dumper, value):
+    # The emitter falls back to quoting when block style cannot represent value
+    style = '|' if '\n' in value else None
+    return dumper.represent_scalar('tag:yaml.org,2002:str', value, style=style)
+
+
+RemediationDumper.add_representer(str, _str_representer)
+
+
+def ensure_doc_marker(raw: bytes):
+    """Prefix raw YAML with a ``---`` document marker if it is missing.
+
+    Args:
+        raw: File contents
+
+    Returns:
+        tuple: (bytes, bool) new contents and whether they changed
+    """
+    if raw.lstrip().startswith(b'---'):
+        return raw, False
+    return b'---\n' + raw, True
+
+
+def strip_nbsp(raw: bytes):
+    """Replace non-breaking spaces (U+00A0) with regular spaces.
+
+    Args:
+        raw: UTF-8 file contents
+
+    Returns:
+        tuple: (bytes, bool) new contents and whether they changed
+    """
+    if NBSP not in raw:
+        return raw, False
+    return raw.replace(NBSP, b' '), True
+
+
+def quote_version(data: dict) -> bool:
+    """Turn a numeric top-level version into a string in place.
+
+    Args:
+        data: Parsed framework dictionary
+
+    Returns:
+        bool: True if the version was converted
+    """
+    version = data.get('version')
+    if isinstance(version, (int, float)) and not isinstance(version, bool):
+        data['version'] = str(version)
+        return True
+    return False
+
+
+def remediate_file(yaml_path: Path) -> dict:
+    """Apply every remediation to a single file.
+
+    Args:
+        yaml_path: Path to the YAML file
+
+    Returns:
+        dict: Fix name -> bool, for each fix that was considered
+
+    Raises:
+        yaml.YAMLError: If YAML parsing fails
+        IOError: If file operations fail
+    """
+    with open(yaml_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        raw = f.read()
+    raw, nbsp = strip_nbsp(raw)
+    raw, marker = ensure_doc_marker(raw)
+    fixes = {'doc_marker': marker, 'nbsp': nbsp}
+
+    # The marker does not change the parse, but NBSP removal does
+    if nbsp:
+        data = yaml.load(raw, Loader=SafeLoader)
+    else:
+        data = load_yaml(yaml_path, raw, SafeLoader, st)
+    if data is None:
+        data = {}
+
+    if isinstance(data, dict):
+        fixes['version'] = quote_version(data)
+        fixes['structure'] = convert_framework_data(data)
+        fixes['metadata'] = merge_metadata(data, _select_template(yaml_path))
+        fixes['escapes'] = _ESCAPED_NEWLINE_RE.search(raw) is not None
+
+    if any(fixes.get(name) for name in _TREE_FIXES):
+        dumped = yaml.dump(data,
+                           Dumper=RemediationDumper,
+                           default_flow_style=False,
+                           allow_unicode=True,
+                           sort_keys=False,
+                           width=120,
+                           indent=2,
+                           explicit_start=True).encode('utf-8')
+        # Block style is not always possible; only count escapes actually removed
+        if fixes['escapes'] and _ESCAPED_NEWLINE_RE.search(dumped):
+            fixes['escapes'] = False
+        if any(fixes[name] for name in _TREE_FIXES):
+            raw = dumped
+
+    if any(fixes.values()):
+        atomic_write(yaml_path, raw)
+
+    return fixes
+
+
+def _remediate_worker(yaml_path: Path):
+    """Process-pool wrapper returning (fixes, error) instead of raising."""
+    try:
+        return remediate_file(yaml_path), None
+    except (yaml.YAMLError, OSError, UnicodeDecodeError) as e:
+        return {}, str(e)
+
+
+def main():
+    """Remediate all framework files in one pass.
+
+    Returns:
+        int: Exit code (0 for success, 1 for error)
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Apply all YAML remediations in a single pass')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    base_dir = Path(os.getenv('SCRATCHPAD_DIR', Path(__file__).parent.parent))
+    frameworks_dir = base_dir / 'frameworks'
+
+    if not frameworks_dir.exists():
+        print(f"❌ Error: Directory not found: {frameworks_dir}")
+        return 1
+
+    cache = ComplianceCache(base_dir, 'remediate_yaml')
+    totals = {}
+    updated = 0
+    skipped = 0
+
+    pending = {}
+    for yaml_file, st in iter_yaml(frameworks_dir):
+        if cache.is_compliant(yaml_file, st):
+            skipped += 1
+        else:
+            pending[yaml_file] = st
+
+    errors = []
+    # Workers finish in any order; report in file name order
+    results = dict(map_files(_remediate_worker, pending, args.jobs))
+    for yaml_file in sorted(results):
+        fixes, error = results[yaml_file]
+        if error:
+            print(f"❌ Error: {yaml_file.name}: {error}")
+            errors.append(yaml_file)
+            continue
+        applied = [name for name, changed in fixes.items() if changed]
+        for name in applied:
+            totals[name] = totals.get(name, 0) + 1
+        if applied:
+            print(f"✅ Fixed: {yaml_file.name} ({', '.join(applied)})")
+            cache.invalidate(yaml_file)
+            updated += 1
+        else:
+            cache.mark_compliant(yaml_file, pending[yaml_file])
+            skipped += 1
+
+    cache.save()
+
+    print()
+    for name, count in sorted(totals.items()):
+        print(f"  {name}: {count} files")
+    print(f"✨ Complete! Updated {updated} files, skipped {skipped}, errors {len(errors)}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Shared Framework File Access for Tests
+
+The regression and validation suites scan the same framework files; list,
+read and parse each one once per test session. Errors are not cached, so
+every test still sees and reports them.
+"""
+
+import functools
+import os
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+from scripts._parse_cache import load_yaml
+from scripts._walk import iter_yaml
+
+
+@functools.lru_cache(maxsize=1)
+def _yaml_files(frameworks_dir):
+    """List the framework files once per test session.
+
+    Args:
+        frameworks_dir: Frameworks directory, as a string so it hashes cheaply
+
+    Returns:
+        tuple: Sorted paths of all .yml files below frameworks_dir
+    """
+    return tuple(sorted(path for path, _ in iter_yaml(frameworks_dir, ('.yml',))))
+
+
+@functools.cache
+def _read_file(yaml_file):
+    """Return (stat taken before the read, raw bytes) of a framework file (memoized)."""
+    with open(yaml_file, 'rb') as f:
+        return os.fstat(f.fileno()), f.read()
+
+
+def _read_bytes(yaml_file):
+    """Return the raw bytes of a framework file (memoized)."""
+    return _read_file(yaml_file)[1]
+
+
+@functools.cache
+def _load_framework(yaml_file):
+    """Parse a framework file once per test session.
+
+    Unchanged files are served from the parsed-YAML sidecar across runs.
+
+    Args:
+        yaml_file: Path to the YAML file
+
+    Returns:
+        Any: Parsed YAML document (shared; must not be mutated)
+    """
+    st, content = _read_file(yaml_file)
+    return load_yaml(yaml_file, content, SafeLoader, st)
@@ -9,6 +9,7 @@ Author: YAML Codex Agent
 Date: 2025-10-01
 """
 
+import re
 import unittest
 import sys
 from pathlib import Path
@@ -19,6 +20,15 @@ import os
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts import generate_framework_docs, add_framework_metadata, fix_yaml_formatting
+from tests._framework_files import _load_framework, _read_bytes, _yaml_files
+
+
+# Literal \n and \t escape sequences in raw file bytes
+_ESCAPE_RE = re.compile(rb'\\[nt]')
+
+# Generated summary timestamps: ISO 8601 (expected) and raw Unix float (Bug 1)
+_ISO_TIMESTAMP_RE = re.compile(r'Last Updated.*\d{4}-\d{2}-\d{2}T')
+_FLOAT_TIMESTAMP_RE = re.compile(r'Last Updated.*:\s+\d{10,}\.\d+\s')
 
 
 class TestBug1ErrorHandling(unittest.TestCase):
@@ -33,9 +43,9 @@ class TestBug1ErrorHandling(unittest.TestCase):
         # Check that the summary contains an ISO-formatted timestamp
         self.assertIn('Last Updated', summary)
         # Should contain ISO format like "2025-10-01T..."
-        self.assertRegex(summary, r'Last Updated.*\d{4}-\d{2}-\d{2}T')
+        self.assertRegex(summary, _ISO_TIMESTAMP_RE)
         # Should NOT contain Unix timestamp float like "**Last Updated**: 1696176000.0"
-        self.assertNotRegex(summary, r'Last Updated.*:\s+\d{10,}\.\d+\s')
+        self.assertNotRegex(summary, _FLOAT_TIMESTAMP_RE)
     
     def test_specific_exception_handling(self):
         """Test that exceptions are specifically caught, not bare except."""
@@ -158,13 +168,12 @@ class TestBug6BackslashEscapes(unittest.TestCase):
         base_dir = Path(__file__).parent.parent
         frameworks_dir = base_dir / 'frameworks'
         
-        yaml_files = list(frameworks_dir.glob('**/*.yml'))
+        yaml_files = _yaml_files(str(frameworks_dir))
         
         files_with_escapes = []
         for yaml_file in yaml_files:
             try:
-                with open(yaml_file, 'r') as f:
-                    data = yaml.safe_load(f)
+                data = _load_framework(yaml_file)
                 
                 # Skip if not a dict or no framework
                 if not isinstance(data, dict) or 'framework' not in data:
@@ -178,11 +187,13 @@ class TestBug6BackslashEscapes(unittest.TestCase):
                 
             except Exception:
                 # If we can't parse it, check raw content
-                content = yaml_file.read_text()
-                # Exclude legacy_content sections from check
-                if 'legacy_content' not in content:
-                    if '\\n' in content or '\\t' in content:
-                        files_with_escapes.append(yaml_file.name)
+                content = _read_bytes(yaml_file)
+                # Exclude legacy_content sections from check: scan only up to
+                # the first legacy_content key, without slicing the bytes
+                cut = content.find(b'legacy_content')
+                end = cut if cut != -1 else len(content)
+                if _ESCAPE_RE.search(content, 0, end):
+                    files_with_escapes.append(yaml_file.name)
         
         # After remediation, this should be empty
         self.assertEqual([], files_with_escapes, 
@@ -197,12 +208,17 @@ class TestBug7DocumentMarkers(unittest.TestCase):
         base_dir = Path(__file__).parent.parent
         frameworks_dir = base_dir / 'frameworks'
         
-        yaml_files = list(frameworks_dir.glob('**/*.yml'))
+        yaml_files = _yaml_files(str(frameworks_dir))
         
         files_missing_markers = []
         for yaml_file in yaml_files:
-            content = yaml_file.read_text()
-            if not content.strip().startswith('---'):
+            # The marker is normally the first thing in the file
+            with open(yaml_file, 'rb') as f:
+                head = f.read(4)
+            if head.startswith(b'---'):
+                continue
+            # Fall back to the whole file to allow leading whitespace
+            if not yaml_file.read_bytes().strip().startswith(b'---'):
                 files_missing_markers.append(yaml_file.name)
         
         # After remediation, all files should have markers
@@ -218,21 +234,18 @@ class TestBug8AmbiguousValues(unittest.TestCase):
         base_dir = Path(__file__).parent.parent
         frameworks_dir = base_dir / 'frameworks'
         
-        yaml_files = list(frameworks_dir.glob('**/*.yml'))
+        yaml_files = _yaml_files(str(frameworks_dir))
         
         files_with_unquoted_versions = []
         for yaml_file in yaml_files:
             try:
-                with open(yaml_file, 'r') as f:
-                    data = yaml.safe_load(f)
-                
-                if data and 'version' in data:
-                    version = data['version']
-                    # Version should be a string, not a number
-                    if not isinstance(version, str):
-                        files_with_unquoted_versions.append(
-                            f"{yaml_file.name} (version={version}, type={type(version).__name__})"
-                        )
+                data = _load_framework(yaml_file)
+                version = data.get('version') if isinstance(data, dict) else None
+                # Version should be a string, not a number
+                if version is not None and not isinstance(version, str):
+                    files_with_unquoted_versions.append(
+                        f"{yaml_file.name} (version={version}, type={type(version).__name__})"
+                    )
             except Exception as e:
                 self.fail(f"Error parsing {yaml_file}: {e}")
         
@@ -249,13 +262,12 @@ class TestYAMLCompliance(unittest.TestCase):
         base_dir = Path(__file__).parent.parent
         frameworks_dir = base_dir / 'frameworks'
         
-        yaml_files = list(frameworks_dir.glob('**/*.yml'))
+        yaml_files = _yaml_files(str(frameworks_dir))
         
         parse_failures = []
         for yaml_file in yaml_files:
             try:
-                with open(yaml_file, 'r') as f:
-                    yaml.safe_load(f)
+                _load_framework(yaml_file)
             except yaml.YAMLError as e:
                 parse_failures.append(f"{yaml_file.name}: {e}")
         
@@ -9,10 +9,16 @@ Author: GitHub Copilot
 Date: 2025-10-03
 """
 
+import contextlib
+import io
+import os
+import re
 import unittest
+from unittest import mock
 import sys
 import tempfile
 import shutil
+import time
 from pathlib import Path
 import yaml
 
@@ -24,10 +30,20 @@ from scripts import (
     add_framework_metadata,
     generate_framework_docs,
     add_yaml_doc_markers,
-    convert_frameworks_to_proper_yaml
+    convert_frameworks_to_proper_yaml,
+    fix_all_yaml_compliance,
+    remediate_yaml,
+    _atomic,
+    _parallel,
+    _parse_cache,
+    _yaml_cache
 )
 
 
+# The generated-at line of a framework summary
+_LAST_UPDATED_RE = re.compile(r'^\*\*Last Updated\*\*: .*$', re.MULTILINE)
+
+
 class TestFixYAMLFormattingEdgeCases(unittest.TestCase):
     """Test edge cases for fix_yaml_formatting.py"""
     
@@ -93,6 +109,34 @@ class TestFixYAMLFormattingEdgeCases(unittest.TestCase):
         self.assertIn('café', content)
         self.assertIn('中文', content)
 
+    
+    def test_main_pool_matches_serial_run(self):
+        """Test that main() with --jobs 2 fixes and reports as a serial run does."""
+        files = {
+            'a.yml': '---\nname: Alpha\nframework:\n  content: "line1\\nline2"\n',
+            'b.yml': ('name: "Beta"\nframework:\n  content: |\n    clean\n'
+                      'version: ""\ncategory: ""\ndocumentation: {}\n'),
+            'core/c.yml': '---\nname: Gamma\nframework:\n  content: "x\\ny"\n',
+        }
+        runs = {}
+        for tree, jobs in (('serial', '1'), ('parallel', '2')):
+            base_dir = self.test_dir / tree
+            for name, text in files.items():
+                path = base_dir / 'frameworks' / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(text)
+            output = io.StringIO()
+            argv = mock.patch.object(sys, 'argv', ['fix_yaml_formatting.py', '--jobs', jobs])
+            env = mock.patch.dict(os.environ, {'SCRATCHPAD_DIR': str(base_dir)})
+            pool = mock.patch.object(_parallel, 'ProcessPoolExecutor', wraps=_parallel.ProcessPoolExecutor)
+            with argv, env, pool as executor, contextlib.redirect_stdout(output):
+                self.assertEqual(fix_yaml_formatting.main(), 0)
+            self.assertEqual(executor.call_count, int(jobs) - 1)
+            contents = {name: (base_dir / 'frameworks' / name).read_text() for name in files}
+            runs[tree] = (output.getvalue(), contents)
+        
+        self.assertEqual(runs['parallel'], runs['serial'])
+        self.assertIn('Fixed 2 files, 1 already clean', runs['serial'][0])
 
 class TestAddFrameworkMetadataEdgeCases(unittest.TestCase):
     """Test edge cases for add_framework_metadata.py"""
@@ -147,6 +191,53 @@ class TestAddFrameworkMetadataEdgeCases(unittest.TestCase):
         self.assertIn('use_case', data['documentation'])
         self.assertEqual(data['documentation']['purpose'], 'Already has purpose')
     
+    def test_missing_metadata_preserves_comments(self):
+        """Test that wholly missing metadata is appended without a rewrite."""
+        test_file = self.test_dir / 'scratchpad-lite.yml'
+        original = '---\n# Keep me\nname: "Lite"\ncategory: core\n'
+        test_file.write_text(original)
+        
+        result = add_framework_metadata.add_metadata_to_framework(test_file)
+        self.assertTrue(result)
+        
+        content = test_file.read_text()
+        self.assertTrue(content.startswith(original))
+        data = yaml.safe_load(content)
+        self.assertEqual(data['version'], '1.0')
+        self.assertIn('Lightweight reasoning framework', data['documentation']['purpose'])
+        
+        # Second pass finds nothing left to add
+        self.assertFalse(add_framework_metadata.add_metadata_to_framework(test_file))
+    
+    def test_complete_metadata_detected_without_parsing(self):
+        """Test the text probe for already complete metadata."""
+        complete = (
+            '---\n'
+            'version: "1.0"\n'
+            'documentation:\n'
+            '  purpose: Already described  # comment\n'
+            '  use_case: Already scoped\n'
+        )
+        self.assertTrue(add_framework_metadata._has_complete_metadata(complete))
+        # Empty or null values still need filling in
+        self.assertFalse(add_framework_metadata._has_complete_metadata(
+            complete.replace('Already scoped', '""')))
+        self.assertFalse(add_framework_metadata._has_complete_metadata(
+            complete.replace('"1.0"', '~')))
+
+        test_file = self.test_dir / 'complete.yml'
+        test_file.write_text(complete)
+        self.assertFalse(add_framework_metadata.add_metadata_to_framework(test_file))
+        self.assertEqual(test_file.read_text(), complete)
+
+    def test_longest_template_key_wins(self):
+        """Test that the most specific template key is chosen on overlap."""
+        yaml_path = self.test_dir / 'planning-13-unified-conscious.yml'
+        
+        template = add_framework_metadata._select_template(yaml_path)
+        
+        self.assertIs(template, add_framework_metadata.METADATA_TEMPLATES['unified-conscious'])
+    
     def test_no_matching_template(self):
         """Test handling of framework with no matching template."""
         test_file = self.test_dir / 'custom-unique-name-xyz.yml'
@@ -227,6 +318,41 @@ class TestGenerateFrameworkDocsEdgeCases(unittest.TestCase):
         self.assertIn('Minimal Framework', summary)
         self.assertIn('N/A', summary)  # Default version
 
+    
+    def test_pool_and_precomputed_frameworks_match_serial_run(self):
+        """Test that jobs=2 and a shared framework list give the serial output."""
+        files = {
+            'core/alpha.yml': {'name': 'Alpha', 'version': '1.0', 'category': 'core',
+                               'documentation': {'purpose': 'First', 'use_case': 'Testing'},
+                               'framework': {'content': 'Alpha content'}},
+            'core/beta.yml': {'name': 'Beta', 'framework': {'content': 'Beta content'}},
+            'personas/gamma.yml': {'name': 'Gamma', 'version': '2.0',
+                                   'framework': {'content': 'Gamma content'}},
+        }
+        for name, data in files.items():
+            path = self.test_dir / 'frameworks' / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(yaml.safe_dump(data))
+        (self.test_dir / 'frameworks' / 'core' / 'bad.yml').write_text('invalid: yaml: [[[')
+        
+        def outputs(**kwargs):
+            summary = generate_framework_docs.generate_framework_summary(self.test_dir, **kwargs)
+            table = generate_framework_docs.generate_comparison_table(self.test_dir, **kwargs)
+            # The summary is stamped with the time it was generated
+            return _LAST_UPDATED_RE.sub('', summary), table
+        
+        serial = outputs()
+        with mock.patch.object(_parallel, 'ProcessPoolExecutor', wraps=_parallel.ProcessPoolExecutor) as pool:
+            parallel = outputs(jobs=2)
+        self.assertEqual(pool.call_count, 2)
+        frameworks = generate_framework_docs._collect_frameworks(self.test_dir)
+        precomputed = outputs(frameworks=frameworks)
+        
+        self.assertEqual(parallel, serial)
+        self.assertEqual(precomputed, serial)
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            self.assertIn(name, serial[0])
+            self.assertIn(name, serial[1])
 
 class TestAddYAMLDocMarkersEdgeCases(unittest.TestCase):
     """Test edge cases for add_yaml_doc_markers.py"""
@@ -263,7 +389,30 @@ class TestAddYAMLDocMarkersEdgeCases(unittest.TestCase):
         
         # Should return False (already has marker after stripping)
         self.assertFalse(result)
-    
+
+    def test_marker_after_long_whitespace(self):
+        """Test marker detection when leading whitespace exceeds the head read."""
+        test_file = self.test_dir / 'long_whitespace.yml'
+        test_file.write_text('\n' * 40 + '---\nname: Test\n')
+        self.assertFalse(add_yaml_doc_markers.add_doc_marker(test_file))
+
+        test_file.write_text('\n' * 40 + 'name: Test\n')
+        self.assertTrue(add_yaml_doc_markers.add_doc_marker(test_file))
+        self.assertTrue(test_file.read_text().startswith('---\n'))
+
+    def test_marker_cut_off_by_head_read(self):
+        """Test markers whose dashes straddle the end of the head read."""
+        test_file = self.test_dir / 'straddle.yml'
+        for padding in range(13, 17):
+            with self.subTest(padding=padding):
+                test_file.write_text(' ' * padding + '---\nname: Test\n')
+                self.assertFalse(add_yaml_doc_markers.add_doc_marker(test_file))
+                self.assertEqual(test_file.read_text().count('---'), 1)
+
+                test_file.write_text(' ' * padding + '- item\n')
+                self.assertTrue(add_yaml_doc_markers.add_doc_marker(test_file))
+                self.assertTrue(test_file.read_text().startswith('---\n'))
+
     def test_empty_file_marker(self):
         """Test adding marker to empty file."""
         test_file = self.test_dir / 'empty.yml'
@@ -347,6 +496,36 @@ class TestConvertFrameworksEdgeCases(unittest.TestCase):
         # Should return False (no XML to convert)
         self.assertFalse(result)
 
+    def test_structure_key_outside_framework(self):
+        """Test that a 'structure' key under another parent does not skip conversion."""
+        test_file = self.test_dir / 'other_structure.yml'
+        test_file.write_text(
+            "documentation:\n"
+            "  structure: notes\n"
+            "framework:\n"
+            "  content: <role>assistant</role>\n"
+        )
+
+        result = convert_frameworks_to_proper_yaml.convert_framework(test_file)
+
+        self.assertTrue(result)
+        with open(test_file) as f:
+            data = yaml.safe_load(f)
+        self.assertEqual(data['framework']['structure'], {'role': 'assistant'})
+
+    def test_crlf_line_endings(self):
+        """Test that the already-converted probe stays linear on CRLF files."""
+        test_file = self.test_dir / 'crlf.yml'
+        lines = ['framework:'] + [f'  line{i}: <role>assistant</role>' for i in range(40)] + ['other: x', '']
+        test_file.write_bytes('\r\n'.join(lines).encode())
+
+        start = time.monotonic()
+        self.assertIsNone(convert_frameworks_to_proper_yaml._CONVERTED_RE.search(test_file.read_bytes()))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+        test_file.write_bytes(b'framework:\r\n  legacy_content: old\r\n\r\n  structure:\r\n    role: assistant\r\n')
+        self.assertFalse(convert_frameworks_to_proper_yaml.convert_framework(test_file))
+
 
 class TestCleanTextFunction(unittest.TestCase):
     """Test the clean_text utility function."""
@@ -391,5 +570,368 @@ class TestParseScratchpadSections(unittest.TestCase):
         self.assertEqual(len(result), 0)
 
 
+class TestParseXmlToYaml(unittest.TestCase):
+    """Test the lxml and regex paths of parse_xml_to_yaml agree."""
+    
+    SAMPLE = """
+    <role>Helpful assistant</role>
+    ----
+    Follow the flow below.
+    <flow>
+        <step_one>Think</step_one>
+        <template>Use this:
+        ```
+        [Goal: what to do]: one line
+        [Plan: how to do it]: numbered steps
+        ```</template>
+    </flow>
+    """
+    
+    def test_lxml_matches_regex_parser(self):
+        """Test that well-formed markup parses identically on both paths."""
+        if convert_frameworks_to_proper_yaml.etree is None:
+            self.skipTest("lxml not installed")
+        
+        tree = convert_frameworks_to_proper_yaml._parse_xml_tree(self.SAMPLE)
+        regex = convert_frameworks_to_proper_yaml._parse_xml_regex(self.SAMPLE)
+        
+        self.assertIsNotNone(tree)
+        self.assertEqual(tree, regex)
+        self.assertEqual(tree['flow']['template']['sections'], ['Goal', 'Plan'])
+        self.assertEqual(tree['instructions'], 'Follow the flow below.')
+    
+    def test_tags_with_spaces_use_regex_parser(self):
+        """Test that non-XML tag names fall back to the regex parser."""
+        content = "<scratchpad flow><step>Think</step></scratchpad flow>"
+        
+        self.assertIsNone(convert_frameworks_to_proper_yaml._parse_xml_tree(content))
+        result = convert_frameworks_to_proper_yaml.parse_xml_to_yaml(content)
+        self.assertEqual(result, {'scratchpad_flow': {'step': 'Think'}})
+
+    def test_same_name_nesting_uses_regex_parser(self):
+        """Test that a tag nested in one of the same name parses as the regex parser does."""
+        for content in ("<a><a>x</a></a>", "<A><b><a>x</a></b></A>"):
+            with self.subTest(content=content):
+                self.assertIsNone(convert_frameworks_to_proper_yaml._parse_xml_tree(content))
+                self.assertEqual(convert_frameworks_to_proper_yaml.parse_xml_to_yaml(content),
+                                 convert_frameworks_to_proper_yaml._parse_xml_regex(content))
+
+    def test_nesting_deeper_than_recursion_limit(self):
+        """Test that the regex parser is not bounded by the recursion limit."""
+        depth = sys.getrecursionlimit() + 100
+        content = 'leaf'
+        for i in range(depth):
+            content = f"<t{i}>{content}</t{i}>"
+
+        node = convert_frameworks_to_proper_yaml._parse_xml_regex(content)
+        for i in reversed(range(depth)):
+            node = node[f"t{i}"]
+        self.assertEqual(node, 'leaf')
+
+
+class TestRemediateYAML(unittest.TestCase):
+    """Test the single-pass remediation in remediate_yaml.py"""
+    
+    def setUp(self):
+        """Set up temporary test directory."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        
+    def tearDown(self):
+        """Clean up temporary test directory."""
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+    
+    def test_all_fixes_in_one_pass(self):
+        """Test that marker, NBSP, version, structure and metadata are fixed together."""
+        test_file = self.test_dir / 'scratchpad-lite.yml'
+        test_file.write_text(
+            'name: Lite\u00a0Test\n'
+            'version: 1.0\n'
+            'framework:\n'
+            '  content: "<role>Helper</role>\\n<task>Think</task>"\n',
+            encoding='utf-8'
+        )
+        
+        fixes = remediate_yaml.remediate_file(test_file)
+        
+        self.assertTrue(all(fixes.values()), fixes)
+        content = test_file.read_text(encoding='utf-8')
+        self.assertTrue(content.startswith('---\n'))
+        self.assertNotIn('\u00a0', content)
+        data = yaml.safe_load(content)
+        self.assertEqual(data['version'], '1.0')
+        self.assertEqual(data['framework']['structure'], {'role': 'Helper', 'task': 'Think'})
+        self.assertIn('Lightweight reasoning framework', data['documentation']['purpose'])
+        # Multi-line legacy text is emitted as a block scalar, not escaped
+        self.assertIn('legacy_content: |', content)
+        
+        # A second pass has nothing left to do and leaves the file alone
+        self.assertFalse(any(remediate_yaml.remediate_file(test_file).values()))
+    
+    def test_escape_only_file_is_rewritten(self):
+        """Test that escaped multi-line strings alone trigger a re-dump."""
+        test_file = self.test_dir / 'escaped.yml'
+        test_file.write_text(
+            '---\n'
+            'name: Escaped\n'
+            'version: "1.0"\n'
+            'category: core\n'
+            'documentation:\n'
+            '  purpose: Test\n'
+            '  use_case: Testing\n'
+            'framework:\n'
+            '  content: "a\\nb"\n'
+        )
+        
+        fixes = remediate_yaml.remediate_file(test_file)
+        
+        self.assertEqual([name for name, changed in fixes.items() if changed], ['escapes'])
+        content = test_file.read_text()
+        self.assertIn('content: |', content)
+        self.assertEqual(yaml.safe_load(content)['framework']['content'], 'a\nb')
+        self.assertFalse(any(remediate_yaml.remediate_file(test_file).values()))
+    
+    def test_non_mapping_only_gets_text_fixes(self):
+        """Test that list documents are not replaced by metadata."""
+        test_file = self.test_dir / 'list.yml'
+        test_file.write_text('- item1\n- item2\n')
+        
+        fixes = remediate_yaml.remediate_file(test_file)
+        
+        self.assertEqual(fixes, {'doc_marker': True, 'nbsp': False})
+        self.assertEqual(test_file.read_text(), '---\n- item1\n- item2\n')
+
+
+class TestComplianceCache(unittest.TestCase):
+    """Test the mtime/size keyed compliance cache in _yaml_cache.py"""
+    
+    def setUp(self):
+        """Set up temporary test directory."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.test_file = self.test_dir / 'cached.yml'
+        self.test_file.write_text('---\nname: Test\n')
+        
+    def tearDown(self):
+        """Clean up temporary test directory."""
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+    
+    def test_roundtrip_across_instances(self):
+        """Test that a compliant verdict persists to disk and is reloaded."""
+        cache = _yaml_cache.ComplianceCache(self.test_dir, 'test')
+        st = self.test_file.stat()
+        self.assertFalse(cache.is_compliant(self.test_file, st))
+        
+        cache.mark_compliant(self.test_file, st)
+        cache.save()
+        
+        reloaded = _yaml_cache.ComplianceCache(self.test_dir, 'test')
+        self.assertTrue(reloaded.is_compliant(self.test_file, st))
+        # Other scripts keep their own verdicts
+        other = _yaml_cache.ComplianceCache(self.test_dir, 'other')
+        self.assertFalse(other.is_compliant(self.test_file, st))
+    
+    def test_modified_file_is_not_compliant(self):
+        """Test that a size change invalidates the cached verdict."""
+        cache = _yaml_cache.ComplianceCache(self.test_dir, 'test')
+        cache.mark_compliant(self.test_file, self.test_file.stat())
+        
+        self.test_file.write_text('---\nname: Changed Test\n')
+        
+        self.assertFalse(cache.is_compliant(self.test_file, self.test_file.stat()))
+    
+    def test_corrupt_cache_file(self):
+        """Test that an unreadable cache file is treated as empty."""
+        cache_file = self.test_dir / '.cache' / _yaml_cache.CACHE_FILENAME
+        cache_file.parent.mkdir()
+        cache_file.write_text('{not json')
+        
+        cache = _yaml_cache.ComplianceCache(self.test_dir, 'test')
+        self.assertFalse(cache.is_compliant(self.test_file, self.test_file.stat()))
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """Test the temp-file-and-rename writer in _atomic.py"""
+    
+    def setUp(self):
+        """Set up temporary test directory."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.test_file = self.test_dir / 'target.yml'
+        self.test_file.write_text('---\nname: Original\n')
+        
+    def tearDown(self):
+        """Clean up temporary test directory."""
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+    
+    def test_replaces_contents(self):
+        """Test that the file is replaced and no temporary file is left."""
+        _atomic.atomic_write(self.test_file, b'---\nname: New\n')
+        
+        self.assertEqual(self.test_file.read_text(), '---\nname: New\n')
+        self.assertEqual([p.name for p in self.test_dir.iterdir()], ['target.yml'])
+    
+    def test_failed_write_keeps_original(self):
+        """Test that an error while writing leaves the original untouched."""
+        with self.assertRaises(RuntimeError), _atomic.atomic_open(self.test_file) as f:
+            f.write(b'partial')
+            raise RuntimeError('interrupted')
+        
+        self.assertEqual(self.test_file.read_text(), '---\nname: Original\n')
+        self.assertEqual([p.name for p in self.test_dir.iterdir()], ['target.yml'])
+    
+    def test_concurrent_writers_use_separate_temp_files(self):
+        """Test that two open writers to one target do not share a temporary file."""
+        with _atomic.atomic_open(self.test_file) as first, _atomic.atomic_open(self.test_file) as second:
+            first.write(b'---\nname: First\n')
+            second.write(b'---\nname: Second\n')
+            self.assertEqual(len(list(self.test_dir.iterdir())), 3)
+        
+        # The last writer to finish replaces the target; nothing is left over
+        self.assertEqual(self.test_file.read_text(), '---\nname: First\n')
+        self.assertEqual([p.name for p in self.test_dir.iterdir()], ['target.yml'])
+    
+    def test_new_file_gets_default_permissions(self):
+        """Test that a newly created file is not left owner-only by mkstemp."""
+        new_file = self.test_dir / 'new.json'
+        _atomic.atomic_write(new_file, b'{}')
+        
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(new_file.stat().st_mode & 0o777, 0o666 & ~umask)
+
+
+class TestParseCache(unittest.TestCase):
+    """Test the parsed-YAML sidecar cache in _parse_cache.py"""
+    
+    def setUp(self):
+        """Set up a temporary repository root."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.test_file = self.test_dir / 'frameworks' / 'cached.yml'
+        self.test_file.parent.mkdir()
+        self.test_file.write_text('---\nname: Test\nversion: "1.0"\n')
+        self.env = mock.patch.dict(os.environ, {'SCRATCHPAD_DIR': str(self.test_dir)})
+        self.env.start()
+        
+    def tearDown(self):
+        """Clean up temporary test directory."""
+        self.env.stop()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+    
+    def _load(self):
+        with open(self.test_file, 'rb') as f:
+            st = os.fstat(f.fileno())
+            return _parse_cache.load_yaml(self.test_file, f.read(), yaml.SafeLoader, st)
+    
+    def test_unchanged_file_loads_from_sidecar(self):
+        """Test that a second load of an unchanged file skips the YAML parse."""
+        self.assertEqual(self._load(), {'name': 'Test', 'version': '1.0'})
+        
+        sidecar = self.test_dir / '.cache' / 'parsed' / 'frameworks' / 'cached.yml.json'
+        self.assertTrue(sidecar.exists())
+        
+        with mock.patch.object(_parse_cache.yaml, 'load') as load:
+            self.assertEqual(self._load(), {'name': 'Test', 'version': '1.0'})
+        load.assert_not_called()
+    
+    def test_modified_file_is_reparsed(self):
+        """Test that a changed file is parsed again rather than served stale."""
+        self._load()
+        self.test_file.write_text('---\nname: Changed\nversion: "1.0"\n')
+        
+        self.assertEqual(self._load()['name'], 'Changed')
+    
+    def test_edit_after_read_is_not_cached_as_current(self):
+        """Test that a file changed after it was read is parsed again next time."""
+        with open(self.test_file, 'rb') as f:
+            st = os.fstat(f.fileno())
+            content = f.read()
+        self.test_file.write_text('---\nname: Edited meanwhile\nversion: "1.0"\n')
+        
+        self.assertEqual(_parse_cache.load_yaml(self.test_file, content, yaml.SafeLoader, st)['name'], 'Test')
+        self.assertEqual(self._load()['name'], 'Edited meanwhile')
+    
+    def test_recursive_alias_is_not_cached(self):
+        """Test that self-referential and shared aliases load without a sidecar."""
+        for text in ('---\nlist: &a [1, *a]\n', '---\nfirst: &a [1]\nsecond: *a\n'):
+            with self.subTest(text=text):
+                self.test_file.write_text(text)
+                
+                data = self._load()
+                
+                self.assertEqual(data[next(iter(data))][0], 1)
+                self.assertFalse((self.test_dir / '.cache').exists())
+    
+    def test_non_json_values_are_not_cached(self):
+        """Test that documents JSON cannot represent exactly skip the sidecar."""
+        self.test_file.write_text('---\n1: one\ncreated: 2025-10-01\n')
+        
+        self._load()
+        
+        self.assertFalse((self.test_dir / '.cache').exists())
+
+
+
+class TestFixAllYAMLComplianceParallel(unittest.TestCase):
+    """Test the process-pool path of fix_all_yaml_compliance.py"""
+    
+    # (relative path, contents) of each framework file in both trees
+    FILES = (
+        ('a.yml', 'name: Alpha\nversion: 1.0\n'),
+        ('b.yml', '---\nname: Beta\nversion: "1.0"\n'),
+        ('sub/c.yml', 'name: Gamma\u00a0Test\n'),
+    )
+    
+    def setUp(self):
+        """Set up two identical framework trees."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        for tree in ('serial', 'parallel'):
+            for name, text in self.FILES:
+                path = self.test_dir / tree / 'frameworks' / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(text, encoding='utf-8')
+        
+    def tearDown(self):
+        """Clean up temporary test directory."""
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+    
+    def _run(self, tree, jobs):
+        """Remediate one tree, returning (stats, per-file log output)."""
+        base_dir = self.test_dir / tree
+        remediator = fix_all_yaml_compliance.YAMLRemediator(verbose=True)
+        output = io.StringIO()
+        # Keep the compliance cache and the summary report out of the repository
+        cache = mock.patch.object(fix_all_yaml_compliance, 'ComplianceCache',
+                                  lambda _, namespace: _yaml_cache.ComplianceCache(base_dir, namespace))
+        summary = mock.patch.object(remediator, 'print_summary')
+        with cache, summary, contextlib.redirect_stdout(output):
+            remediator.process_directory(base_dir / 'frameworks', jobs=jobs)
+        return remediator.stats, output.getvalue()
+    
+    def test_pool_matches_serial_run(self):
+        """Test that worker stats and buffered messages merge as a serial run's do."""
+        serial_stats, serial_output = self._run('serial', 1)
+        with mock.patch.object(_parallel, 'ProcessPoolExecutor', wraps=_parallel.ProcessPoolExecutor) as pool:
+            parallel_stats, parallel_output = self._run('parallel', 2)
+        pool.assert_called_once_with(max_workers=2)
+        
+        self.assertEqual(parallel_stats, serial_stats)
+        self.assertEqual(parallel_stats['files_processed'], 3)
+        self.assertEqual(parallel_stats['doc_markers_added'], 2)
+        self.assertEqual(parallel_stats['nbsp_removed'], 1)
+        self.assertEqual(parallel_stats['errors'], [])
+        
+        # Buffered per-file messages are replayed in file name order
+        self.assertEqual(parallel_output, serial_output)
+        processing = [line for line in parallel_output.splitlines() if line.startswith('Processing:')]
+        self.assertEqual(processing, ['Processing: a.yml', 'Processing: b.yml', 'Processing: c.yml'])
+        
+        for name, _ in self.FILES:
+            self.assertEqual((self.test_dir / 'parallel' / 'frameworks' / name).read_bytes(),
+                             (self.test_dir / 'serial' / 'frameworks' / name).read_bytes())
+
+
 if __name__ == '__main__':
     unittest.main()
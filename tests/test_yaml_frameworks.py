@@ -7,16 +7,178 @@ Author: Warp AI Agent
 Date: 2025-10-01
 """
 
+import os
 import sys
-import yaml
 from pathlib import Path
 import re
 
+import yaml
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests._framework_files import _load_framework, _yaml_files
+
+# Runs of whitespace, collapsed when comparing content samples
+_WHITESPACE_RE = re.compile(r'\s+')
+
+REQUIRED_KEYS = ('name', 'category', 'documentation', 'framework')
+
+# By default each test stops at the failure that already decides it; set
+# COLLECT_ALL=1 to check every file and report every problem
+COLLECT_ALL = os.getenv('COLLECT_ALL') == '1'
+
+
+def _stop_early(failures, limit=1):
+    """Return True once a test has enough failures to fail in fail-fast mode.
+    
+    Args:
+        failures: Failures (or warnings) counted so far
+        limit: Count at which the test's assertion can no longer pass
+        
+    Returns:
+        bool: True if the remaining files can be skipped
+    """
+    if COLLECT_ALL or failures < limit:
+        return False
+    print("  (stopping early; set COLLECT_ALL=1 to check every file)")
+    return True
+
+
+def _check_required_keys(name, data):
+    """Check one parsed document for the keys every framework needs.
+    
+    Args:
+        name: File name used in the messages
+        data: Parsed YAML document
+        
+    Returns:
+        list: Problem messages (empty if the document passes)
+    """
+    if not isinstance(data, dict):
+        return [f"  ❌ {name}: Not a YAML dictionary"]
+    missing_keys = [key for key in REQUIRED_KEYS if key not in data]
+    if missing_keys:
+        return [f"  ⚠️  {name}: Missing keys {missing_keys}"]
+    return []
+
+
+def _check_field_types(name, data):
+    """Check the types of one parsed document's top-level fields.
+    
+    Args:
+        name: File name used in the messages
+        data: Parsed YAML document
+        
+    Returns:
+        list: Problem messages (empty if the document passes)
+    """
+    if not isinstance(data, dict):
+        return [f"  ❌ {name}: Not a YAML dictionary"]
+    errors = []
+    for key in ('name', 'version', 'category'):
+        if key in data and not isinstance(data[key], str):
+            errors.append(f"'{key}' must be a string")
+    for key in ('documentation', 'framework'):
+        if key in data and not isinstance(data[key], dict):
+            errors.append(f"'{key}' must be a dictionary")
+    if errors:
+        return [f"  ❌ {name}: {', '.join(errors)}"]
+    return []
+
+
+def _framework_content(data):
+    """Return a document's framework content string, or None if it has none."""
+    if not isinstance(data, dict) or not isinstance(data.get('framework'), dict):
+        return None
+    content = data['framework'].get('content')
+    return content if isinstance(content, str) else None
+
+
+def _check_metadata(name, data):
+    """Check the metadata quality of one parsed document.
+    
+    Args:
+        name: File name used in the messages
+        data: Parsed YAML document
+        
+    Returns:
+        list: Warning messages (empty if the document passes)
+    """
+    if not isinstance(data, dict):
+        return [f"  ❌ {name}: Not a YAML dictionary"]
+    warnings = []
+    
+    # Check documentation fields (purpose should be concise)
+    doc = data.get('documentation')
+    if isinstance(doc, dict):
+        for key, label, limit in (('purpose', 'Purpose', 30), ('use_case', 'Use case', 40)):
+            value = doc.get(key)
+            if not value:
+                warnings.append(f"  ⚠️  {name}: Missing or empty {key} field")
+            elif not isinstance(value, str):
+                warnings.append(f"  ⚠️  {name}: {label} is not a string")
+            elif len(value.split()) > limit:
+                warnings.append(
+                    f"  ⚠️  {name}: {label} too long ({len(value.split())} words, recommend <{limit})")
+    
+    # Check version field
+    if not data.get('version'):
+        warnings.append(f"  ⚠️  {name}: Missing or empty version field")
+    
+    # Check content field
+    content = _framework_content(data)
+    if content is not None and len(content) < 100:
+        warnings.append(f"  ⚠️  {name}: Framework content seems too short ({len(content)} chars)")
+    
+    return warnings
+
+
+def _check_uniqueness(name, data, seen):
+    """Compare one document's content sample with those already seen.
+    
+    The sample is the first 500 characters of the content field, normalized
+    to lowercase with whitespace collapsed.
+    
+    Args:
+        name: File name used in the messages
+        data: Parsed YAML document
+        seen: Normalized sample -> first file name that had it; updated
+        
+    Returns:
+        list: Warning messages (empty if the document passes)
+    """
+    content = _framework_content(data)
+    if content is None:
+        return []
+    normalized = _WHITESPACE_RE.sub(' ', content[:500].lower())
+    if normalized in seen:
+        return [f"  ⚠️  {name} may be similar to {seen[normalized]}"]
+    seen[normalized] = name
+    return []
+
+
+def _categorize(frameworks_dir, yaml_files):
+    """Group framework files by their expected category directory.
+    
+    Args:
+        frameworks_dir: Frameworks directory the files were listed from
+        yaml_files: Framework files
+        
+    Returns:
+        dict: Category -> list of files directly inside it
+    """
+    return {
+        category: [f for f in yaml_files if f.parent == frameworks_dir / category]
+        for category in ('core', 'purpose-built', 'personas')
+    }
+
+
 def test_yaml_syntax():
     """Test that all YAML files have valid syntax.
     
     This test validates that all YAML framework files in the frameworks/
-    directory can be successfully parsed by PyYAML's safe_load function.
+    directory can be successfully parsed by PyYAML's safe loader.
     
     Raises:
         AssertionError: If any YAML files fail to parse
@@ -24,7 +186,7 @@ def test_yaml_syntax():
     base_dir = Path(__file__).parent.parent
     frameworks_dir = base_dir / 'frameworks'
     
-    yaml_files = list(frameworks_dir.glob('**/*.yml'))
+    yaml_files = _yaml_files(str(frameworks_dir))
     if not yaml_files:
         print("❌ FAIL: No YAML files found")
         return False
@@ -35,9 +197,10 @@ def test_yaml_syntax():
     failed = 0
     
     for yaml_file in yaml_files:
+        if _stop_early(failed):
+            break
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                yaml.safe_load(f)
+            _load_framework(yaml_file)
             print(f"  ✅ {yaml_file.relative_to(base_dir)}")
             passed += 1
         except Exception as e:
@@ -63,31 +226,24 @@ def test_required_keys():
     base_dir = Path(__file__).parent.parent
     frameworks_dir = base_dir / 'frameworks'
     
-    required_keys = ['name', 'category', 'documentation', 'framework']
-    
-    yaml_files = list(frameworks_dir.glob('**/*.yml'))
+    yaml_files = _yaml_files(str(frameworks_dir))
     passed = 0
     failed = 0
     
     for yaml_file in yaml_files:
+        if _stop_early(failed):
+            break
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            if not isinstance(data, dict):
-                print(f"  ❌ {yaml_file.name}: Not a YAML dictionary")
-                failed += 1
-                continue
-            
-            missing_keys = [key for key in required_keys if key not in data]
-            if missing_keys:
-                print(f"  ⚠️  {yaml_file.name}: Missing keys {missing_keys}")
-                failed += 1
-            else:
-                passed += 1
+            problems = _check_required_keys(yaml_file.name, _load_framework(yaml_file))
         except Exception as e:
-            print(f"  ❌ {yaml_file.name}: {e}")
+            problems = [f"  ❌ {yaml_file.name}: {e}"]
+        
+        for problem in problems:
+            print(problem)
+        if problems:
             failed += 1
+        else:
+            passed += 1
     
     print(f"Required Keys: {passed} passed, {failed} failed")
     assert failed == 0
@@ -109,11 +265,8 @@ def test_framework_categories():
     base_dir = Path(__file__).parent.parent
     frameworks_dir = base_dir / 'frameworks'
     
-    categories = {
-        'core': list((frameworks_dir / 'core').glob('*.yml')),
-        'purpose-built': list((frameworks_dir / 'purpose-built').glob('*.yml')),
-        'personas': list((frameworks_dir / 'personas').glob('*.yml'))
-    }
+    yaml_files = _yaml_files(str(frameworks_dir))
+    categories = _categorize(frameworks_dir, yaml_files)
     
     print("Framework Categories:")
     for category, files in categories.items():
@@ -148,45 +301,15 @@ def test_metadata_quality():
     base_dir = Path(__file__).parent.parent
     frameworks_dir = base_dir / 'frameworks'
     
-    yaml_files = list(frameworks_dir.glob('**/*.yml'))
+    yaml_files = _yaml_files(str(frameworks_dir))
     passed = 0
     warnings = []
     
     for yaml_file in yaml_files:
+        if _stop_early(len(warnings), 10):
+            break
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            # Check documentation fields
-            if 'documentation' in data:
-                doc = data['documentation']
-                
-                # Check purpose length (should be concise)
-                if 'purpose' in doc and doc['purpose']:
-                    purpose_words = len(doc['purpose'].split())
-                    if purpose_words > 30:
-                        warnings.append(f"  ⚠️  {yaml_file.name}: Purpose too long ({purpose_words} words, recommend <30)")
-                else:
-                    warnings.append(f"  ⚠️  {yaml_file.name}: Missing or empty purpose field")
-                
-                # Check use_case field
-                if 'use_case' in doc and doc['use_case']:
-                    use_case_words = len(doc['use_case'].split())
-                    if use_case_words > 40:
-                        warnings.append(f"  ⚠️  {yaml_file.name}: Use case too long ({use_case_words} words, recommend <40)")
-                else:
-                    warnings.append(f"  ⚠️  {yaml_file.name}: Missing or empty use_case field")
-            
-            # Check version field
-            if 'version' not in data or not data['version']:
-                warnings.append(f"  ⚠️  {yaml_file.name}: Missing or empty version field")
-            
-            # Check content field
-            if 'framework' in data and 'content' in data['framework']:
-                content = data['framework']['content']
-                if len(content) < 100:
-                    warnings.append(f"  ⚠️  {yaml_file.name}: Framework content seems too short ({len(content)} chars)")
-            
+            warnings.extend(_check_metadata(yaml_file.name, _load_framework(yaml_file)))
             passed += 1
         except Exception as e:
             warnings.append(f"  ❌ {yaml_file.name}: Error reading file - {e}")
@@ -217,40 +340,24 @@ def test_field_types():
     base_dir = Path(__file__).parent.parent
     frameworks_dir = base_dir / 'frameworks'
     
-    yaml_files = list(frameworks_dir.glob('**/*.yml'))
+    yaml_files = _yaml_files(str(frameworks_dir))
     passed = 0
     failed = 0
     
     for yaml_file in yaml_files:
+        if _stop_early(failed):
+            break
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            errors = []
-            
-            # Check string fields
-            if 'name' in data and not isinstance(data['name'], str):
-                errors.append("'name' must be a string")
-            if 'version' in data and not isinstance(data.get('version'), str):
-                errors.append("'version' must be a string")
-            if 'category' in data and not isinstance(data['category'], str):
-                errors.append("'category' must be a string")
-            
-            # Check nested dict fields
-            if 'documentation' in data and not isinstance(data['documentation'], dict):
-                errors.append("'documentation' must be a dictionary")
-            if 'framework' in data and not isinstance(data['framework'], dict):
-                errors.append("'framework' must be a dictionary")
-            
-            if errors:
-                print(f"  ❌ {yaml_file.name}: {', '.join(errors)}")
-                failed += 1
-            else:
-                passed += 1
-                
+            problems = _check_field_types(yaml_file.name, _load_framework(yaml_file))
         except Exception as e:
-            print(f"  ❌ {yaml_file.name}: {e}")
+            problems = [f"  ❌ {yaml_file.name}: {e}"]
+        
+        for problem in problems:
+            print(problem)
+        if problems:
             failed += 1
+        else:
+            passed += 1
     
     print(f"Field Types: {passed} passed, {failed} failed")
     assert failed == 0
@@ -272,30 +379,19 @@ def test_content_uniqueness():
     base_dir = Path(__file__).parent.parent
     frameworks_dir = base_dir / 'frameworks'
     
-    yaml_files = list(frameworks_dir.glob('**/*.yml'))
+    yaml_files = _yaml_files(str(frameworks_dir))
     
-    # Extract first 500 chars of each framework's content
-    content_samples = {}
+    # Compare each framework's content sample with those read before it
+    duplicates = []
+    seen = {}
     for yaml_file in yaml_files:
+        if _stop_early(len(duplicates)):
+            break
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            if 'framework' in data and 'content' in data['framework']:
-                content = data['framework']['content']
-                # Normalize: lowercase, remove extra whitespace
-                normalized = re.sub(r'\s+', ' ', content[:500].lower())
-                content_samples[yaml_file.name] = normalized
+            data = _load_framework(yaml_file)
         except Exception:
             continue
-    
-    # Simple similarity check - look for exact duplicates
-    duplicates = []
-    seen = {}
-    for name, content in content_samples.items():
-        if content in seen:
-            duplicates.append(f"  ⚠️  {name} may be similar to {seen[content]}")
-        else:
-            seen[content] = name
+        duplicates.extend(_check_uniqueness(yaml_file.name, data, seen))
     
     if duplicates:
         print("\nPotential Content Duplicates:")
@@ -307,10 +403,54 @@ def test_content_uniqueness():
     assert len(duplicates) == 0
 
 
+def _single_pass_validate(frameworks_dir, yaml_files):
+    """Run every check in main() over each framework file in one pass.
+    
+    Each file is read and parsed once; the per-file checks shared with the
+    test functions above then all run on the parsed document.
+    
+    Args:
+        frameworks_dir: Frameworks directory the files were listed from
+        yaml_files: Framework files to validate
+        
+    Returns:
+        dict: Check name -> list of problem messages, plus 'categories'
+        mapping each expected category to its framework count
+    """
+    results = {
+        'syntax': [],
+        'required_keys': [],
+        'field_types': [],
+        'metadata': [],
+        'uniqueness': [],
+        'categories': {
+            category: len(files)
+            for category, files in _categorize(frameworks_dir, yaml_files).items()
+        },
+    }
+    seen = {}
+    
+    for yaml_file in yaml_files:
+        try:
+            data = _load_framework(yaml_file)
+        except (yaml.YAMLError, OSError, UnicodeDecodeError) as e:
+            for check in ('syntax', 'required_keys', 'field_types'):
+                results[check].append(f"  ❌ {yaml_file.name}: {e}")
+            results['metadata'].append(f"  ❌ {yaml_file.name}: Error reading file - {e}")
+            continue
+        
+        results['required_keys'].extend(_check_required_keys(yaml_file.name, data))
+        results['field_types'].extend(_check_field_types(yaml_file.name, data))
+        results['metadata'].extend(_check_metadata(yaml_file.name, data))
+        results['uniqueness'].extend(_check_uniqueness(yaml_file.name, data, seen))
+    
+    return results
+
+
 def main():
-    """Run all tests and provide summary report.
+    """Run all checks in a single pass and provide summary report.
     
-    Executes the complete test suite for YAML framework validation including:
+    Validates every framework file once for:
     - Syntax validation
     - Required keys check
     - Field type validation  
@@ -329,33 +469,43 @@ def main():
     print("="*70)
     print()
     
-    tests = [
-        ("YAML Syntax Validation", test_yaml_syntax),
-        ("Required Keys Check", test_required_keys),
-        ("Field Type Validation", test_field_types),
-        ("Metadata Quality Check", test_metadata_quality),
-        ("Content Uniqueness Check", test_content_uniqueness),
-        ("Framework Categories", test_framework_categories),
+    base_dir = Path(__file__).parent.parent
+    frameworks_dir = base_dir / 'frameworks'
+    yaml_files = _yaml_files(str(frameworks_dir))
+    print(f"Found {len(yaml_files)} YAML files")
+    
+    results = _single_pass_validate(frameworks_dir, yaml_files)
+    total = sum(results['categories'].values())
+    
+    # (name, problems, passed, failure is only a warning)
+    checks = [
+        ("YAML Syntax Validation", results['syntax'], bool(yaml_files) and not results['syntax'], False),
+        ("Required Keys Check", results['required_keys'], not results['required_keys'], False),
+        ("Field Type Validation", results['field_types'], not results['field_types'], False),
+        ("Metadata Quality Check", results['metadata'], len(results['metadata']) < 10, True),
+        ("Content Uniqueness Check", results['uniqueness'], not results['uniqueness'], True),
+        ("Framework Categories",
+         [f"  {category}: {count} frameworks" for category, count in results['categories'].items()],
+         total >= 20, False),
     ]
     
     passed = 0
     failed = 0
     warnings = 0
     
-    for test_name, test_func in tests:
+    for test_name, problems, ok, warn_only in checks:
         print(f"\n--- {test_name} ---")
-        result = test_func()
-        if result:
+        for problem in problems:
+            print(problem)
+        if ok:
             print(f"✅ {test_name} PASSED")
             passed += 1
+        elif warn_only:
+            print(f"⚠️  {test_name} HAS WARNINGS")
+            warnings += 1
         else:
-            # Metadata quality and uniqueness can fail with warnings
-            if "Quality" in test_name or "Uniqueness" in test_name:
-                print(f"⚠️  {test_name} HAS WARNINGS")
-                warnings += 1
-            else:
-                print(f"❌ {test_name} FAILED")
-                failed += 1
+            print(f"❌ {test_name} FAILED")
+            failed += 1
     
     print()
     print("="*70)